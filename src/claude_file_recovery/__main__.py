@@ -1,3 +1,4 @@
 from claude_file_recovery.cli import app
 
-app()
+if __name__ == "__main__":
+    app()
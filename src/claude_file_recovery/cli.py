@@ -55,7 +55,9 @@ def _scan_with_progress(claude_dir: Path) -> dict:
         def on_progress(completed: int, total: int):
             progress.update(task, total=total, completed=completed)
 
-        result = scan_all_sessions(claude_dir, progress_callback=on_progress)
+        result = scan_all_sessions(
+            claude_dir, progress_callback=on_progress, use_processes=True
+        )
 
     return result
 
@@ -253,7 +255,9 @@ def extract_files(
             strip_injected_content,
         )
 
-        patterns = detect_injected_content(files)
+        # Read ops per pattern, so stripping needn't re-extract every block
+        ops_by_pattern: dict[str, list] = {}
+        patterns = detect_injected_content(files, ops_by_pattern=ops_by_pattern)
         if patterns:
             total_ops = sum(p.affected_op_count for p in patterns)
             total_files = sum(p.affected_file_count for p in patterns)
@@ -261,7 +265,7 @@ def extract_files(
                 f"[yellow]Detected injected content in {total_ops} Read operations "
                 f"across {total_files} files. Stripping from recovered content.[/yellow]"
             )
-            strip_injected_content(files, patterns)
+            strip_injected_content(files, patterns, ops_by_pattern)
 
     # Apply symlink deduplication if YAML provided
     if symlink_file and symlink_file.exists():
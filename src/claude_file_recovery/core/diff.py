@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import difflib
+from collections.abc import Callable
+from functools import partial
 
 from rich.text import Text
 
@@ -16,13 +18,21 @@ _STYLE_CONTEXT = "dim"
 
 
 def compute_before_after(
-    operations: list[FileOperation], index: int
+    operations: list[FileOperation],
+    index: int,
+    content_at: Callable[[int], str | None] | None = None,
 ) -> tuple[str | None, str | None]:
     """Compute the before and after states for a diff at the given operation index.
 
+    content_at, if given, returns the file content after an operation index
+    (e.g. from a snapshot cache); by default each state is replayed.
+
     Returns (before, after) where either may be None if content is unavailable.
     """
-    after = reconstruct_file_at(operations, index)
+    if content_at is None:
+        content_at = partial(reconstruct_file_at, operations)
+
+    after = content_at(index)
     if after is None:
         return None, None
 
@@ -35,7 +45,7 @@ def compute_before_after(
         # original_file is the authoritative pre-edit state from disk
         before = op.original_file
     else:
-        before = reconstruct_file_at(operations, index - 1)
+        before = content_at(index - 1)
 
     if before is None:
         before = ""
@@ -43,8 +53,13 @@ def compute_before_after(
     return before, after
 
 
-def format_diff_text(before: str, after: str, filepath: str) -> Text:
-    """Generate a colored unified diff as a rich.text.Text object."""
+def format_diff_text(
+    before: str, after: str, filepath: str, *, prefix: str = ""
+) -> Text:
+    """Generate a colored unified diff as a rich.text.Text object.
+
+    prefix, if given, is emitted unstyled ahead of the diff.
+    """
     before_lines = before.splitlines(keepends=True)
     after_lines = after.splitlines(keepends=True)
 
@@ -57,10 +72,11 @@ def format_diff_text(before: str, after: str, filepath: str) -> Text:
         )
     )
 
+    text = Text(prefix)
     if not diff_lines:
-        return Text("[No changes]", style="dim italic")
+        text.append("[No changes]", style="dim italic")
+        return text
 
-    text = Text()
     for line in diff_lines:
         if line.startswith("---") or line.startswith("+++"):
             text.append(line, style=_STYLE_FILE_HEADER)
@@ -76,8 +92,13 @@ def format_diff_text(before: str, after: str, filepath: str) -> Text:
     return text
 
 
-def format_full_diff_text(before: str, after: str, filepath: str) -> Text:
-    """Generate a colored unified diff with full file context."""
+def format_full_diff_text(
+    before: str, after: str, filepath: str, *, prefix: str = ""
+) -> Text:
+    """Generate a colored unified diff with full file context.
+
+    prefix, if given, is emitted unstyled ahead of the diff.
+    """
     before_lines = before.splitlines(keepends=True)
     after_lines = after.splitlines(keepends=True)
 
@@ -94,10 +115,11 @@ def format_full_diff_text(before: str, after: str, filepath: str) -> Text:
         )
     )
 
+    text = Text(prefix)
     if not diff_lines:
-        return Text("[No changes]", style="dim italic")
+        text.append("[No changes]", style="dim italic")
+        return text
 
-    text = Text()
     for line in diff_lines:
         if line.startswith("---") or line.startswith("+++"):
             text.append(line, style=_STYLE_FILE_HEADER)
@@ -119,6 +141,7 @@ def format_read_range_view(
     read_limit: int | None,
     *,
     full: bool = True,
+    prefix: str = "",
 ) -> Text:
     """Render file content with gutter markers indicating the read range.
 
@@ -130,6 +153,7 @@ def format_read_range_view(
 
     read_offset is 1-indexed (matching Read tool's "line number to start reading from").
     read_limit is the number of lines to read.
+    prefix, if given, is emitted unstyled ahead of the view.
     """
     lines = full_content.split("\n")
     total = len(lines)
@@ -143,7 +167,7 @@ def format_read_range_view(
     is_full_read = read_offset is None and read_limit is None
 
     line_num_width = len(str(total))
-    text = Text()
+    text = Text(prefix)
 
     if is_full_read:
         text.append("[Full file read]\n\n", style="dim italic")
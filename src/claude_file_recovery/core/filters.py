@@ -5,8 +5,8 @@ from __future__ import annotations
 import enum
 import fnmatch
 import re
-
-from textual.fuzzy import Matcher
+from functools import lru_cache
+from operator import itemgetter
 
 from claude_file_recovery.core.models import RecoverableFile
 
@@ -31,14 +31,102 @@ def smart_case_sensitive(pattern: str, explicit_override: bool | None = None) ->
     return any(c.isupper() for c in pattern)
 
 
+# Word starts, which earn a bonus in fuzzy scoring
+_WORD_RE = re.compile(r"\w+")
+
+
+def _fuzzy_score(query: str, candidate: str) -> float:
+    """Score a lowercased fuzzy query against a lowercased candidate.
+
+    Returns the same score as Textual's ``Matcher(query).match(candidate)``:
+    the best, over every way of placing the query's letters in order, of
+    (letters + word-start hits) * (1 + (1 - extra groups / letters) ** 2),
+    with a 1.5x (2x on equality) bonus for a plain substring hit. Textual
+    enumerates every placement, which explodes on long paths with repeated
+    letters. Here, for each placement end and group count, only the most
+    word-start hits is kept, so the cost is polynomial.
+    """
+    first_letters = {m.start() for m in _WORD_RE.finditer(candidate)}
+    k = len(query)
+
+    if query in candidate:
+        # Substring hit: Textual scores only the first occurrence
+        start = candidate.find(query)
+        hits = sum(1 for i in range(start, start + k) if i in first_letters)
+        score = k + hits
+        score *= 2.0  # one group: 1 + (1.0 * 1.0)
+        return score * (2.0 if candidate == query else 1.5)
+
+    # Candidate positions per query letter, gathered exactly as Textual does
+    # (each letter searched from just past the previous letter's first hit,
+    # stopping after the first hit too close to the end), then a DP over
+    # them: states maps placement end -> {group count: max word-start hits}.
+    states: dict[int, dict[int, int]] = {}
+    position = 0
+    size = len(candidate)
+    find = candidate.find
+    for offset, letter in enumerate(query):
+        last_index = size - offset
+        positions = []
+        index = position
+        while (location := find(letter, index)) != -1:
+            positions.append(location)
+            index = location + 1
+            if index >= last_index:
+                break
+        if not positions:
+            return 0.0
+        position = positions[0] + 1
+        if offset == 0:
+            states = {p: {1: int(p in first_letters)} for p in positions}
+            continue
+        new_states = {}
+        for p in positions:
+            hit = p in first_letters
+            best: dict[int, int] = {}
+            # states is keyed in increasing position order
+            for prev, groups in states.items():
+                if prev >= p:
+                    break
+                step = 0 if prev == p - 1 else 1
+                for g, f in groups.items():
+                    if best.get(g + step, -1) < f:
+                        best[g + step] = f
+            if best:
+                new_states[p] = {g: f + hit for g, f in best.items()}
+        if not new_states:
+            return 0.0
+        states = new_states
+
+    best_hits: dict[int, int] = {}
+    for groups in states.values():
+        for g, f in groups.items():
+            if best_hits.get(g, -1) < f:
+                best_hits[g] = f
+    result = 0.0
+    for g, f in best_hits.items():
+        # Same arithmetic as Textual's FuzzySearch.score, so floats match
+        score = k + f
+        normalized_groups = (k - (g - 1)) / k
+        score *= 1 + (normalized_groups * normalized_groups)
+        if score > result:
+            result = score
+    return result
+
+
 def match_path(
     path: str,
     pattern: str,
     mode: SearchMode,
     case_sensitive: bool,
+    *,
+    path_lower: str | None = None,
 ) -> float:
     """Score how well *path* matches *pattern* under the given mode.
 
+    *path_lower* may carry a precomputed ``path.lower()`` so callers that
+    match the same paths repeatedly don't lowercase them on every call.
+
     Returns:
         >0.0 for a match (fuzzy returns a relevance score; glob/regex return 1.0).
         0.0 for no match.
@@ -47,35 +135,56 @@ def match_path(
         return 1.0  # empty pattern matches everything
 
     if mode is SearchMode.FUZZY:
-        matcher = Matcher(pattern, case_sensitive=case_sensitive)
-        return matcher.match(path)
+        # The scorer compares lowercased strings and needs every query
+        # character to appear in order, so a path missing any of them
+        # cannot score. Rejecting those here skips the scorer entirely.
+        lowered = path.lower() if path_lower is None else path_lower
+        if not all(c in lowered for c in set(pattern.lower())):
+            return 0.0
+        return _fuzzy_score(pattern.lower(), lowered)
 
     if mode is SearchMode.GLOB:
-        p, basename = path, path.rsplit("/", 1)[-1] if "/" in path else path
         if case_sensitive:
-            matched = fnmatch.fnmatchcase(p, pattern) or fnmatch.fnmatchcase(
-                basename, pattern
-            )
+            match = compile_glob(pattern).match
         else:
-            matched = fnmatch.fnmatch(p.lower(), pattern.lower()) or fnmatch.fnmatch(
-                basename.lower(), pattern.lower()
-            )
+            path = path.lower() if path_lower is None else path_lower
+            match = compile_glob(pattern.lower()).match
+        matched = match(path) or match(path.rsplit("/", 1)[-1])
         return 1.0 if matched else 0.0
 
     if mode is SearchMode.REGEX:
         try:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            return 1.0 if re.search(pattern, path, flags) else 0.0
+            regex = compile_regex(pattern, 0 if case_sensitive else re.IGNORECASE)
         except re.error:
             return 0.0
+        return 1.0 if regex.search(path) else 0.0
 
     return 0.0
 
 
+@lru_cache(maxsize=128)
+def compile_regex(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """Compile *pattern*, memoized so repeated keystrokes reuse the Pattern.
+
+    Raises re.error for an invalid pattern (failures are not cached).
+    """
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=128)
+def compile_glob(pattern: str) -> re.Pattern[str]:
+    """Translate glob *pattern* into an anchored, memoized Pattern.
+
+    ``Pattern.match`` on the result agrees with ``fnmatch.fnmatchcase``;
+    lowercase both sides for a case-insensitive match.
+    """
+    return re.compile(fnmatch.translate(pattern))
+
+
 def validate_regex(pattern: str) -> str | None:
     """Return an error message if *pattern* is not valid regex, else None."""
     try:
-        re.compile(pattern)
+        compile_regex(pattern)
         return None
     except re.error as e:
         return str(e)
@@ -103,7 +212,7 @@ def filter_files(
             score = match_path(path, pattern, mode, case_sensitive)
             if score > 0:
                 scored.append((score, path, rf))
-        scored.sort(key=lambda x: x[0], reverse=True)
+        scored.sort(key=itemgetter(0), reverse=True)
         return {path: rf for _, path, rf in scored}
 
     return {
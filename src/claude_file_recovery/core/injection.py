@@ -12,6 +12,7 @@ from __future__ import annotations
 from collections import Counter
 
 from claude_file_recovery.core.models import (
+    FileOperation,
     InjectedContentPattern,
     OpType,
     RecoverableFile,
@@ -53,6 +54,7 @@ def _extract_trailing_block(content: str) -> str | None:
 def detect_injected_content(
     files: dict[str, RecoverableFile],
     threshold: float = 0.20,
+    ops_by_pattern: dict[str, list[FileOperation]] | None = None,
 ) -> list[InjectedContentPattern]:
     """Detect injected content patterns across all Read operations.
 
@@ -60,9 +62,12 @@ def detect_injected_content(
     each op's content, groups by exact match, and returns InjectedContentPattern
     for each trailing block that appears in >= threshold fraction of files
     with Read ops.
+
+    If ops_by_pattern is given, it is filled with the Read ops carrying each
+    pattern, keyed by pattern_id, for strip_injected_content to reuse.
     """
     trailing_file_count: Counter[str] = Counter()
-    trailing_op_count: Counter[str] = Counter()
+    ops_by_trailing: dict[str, list[FileOperation]] = {}
     files_with_reads = 0
 
     for rf in files.values():
@@ -76,7 +81,7 @@ def detect_injected_content(
             trailing = _extract_trailing_block(op.content)
             if not trailing:
                 continue
-            trailing_op_count[trailing] += 1
+            ops_by_trailing.setdefault(trailing, []).append(op)
             if trailing not in seen_in_file:
                 seen_in_file.add(trailing)
                 trailing_file_count[trailing] += 1
@@ -90,16 +95,19 @@ def detect_injected_content(
     for idx, (content, file_count) in enumerate(trailing_file_count.most_common()):
         if file_count < min_files:
             break
+        pattern_id = f"trailing-suffix-{idx + 1}"
         patterns.append(
             InjectedContentPattern(
-                pattern_id=f"trailing-suffix-{idx + 1}",
+                pattern_id=pattern_id,
                 content=content,
-                affected_op_count=trailing_op_count[content],
+                affected_op_count=len(ops_by_trailing[content]),
                 affected_file_count=file_count,
                 sample=content[:120] + ("..." if len(content) > 120 else ""),
                 detection_method="threshold-suffix",
             )
         )
+        if ops_by_pattern is not None:
+            ops_by_pattern[pattern_id] = ops_by_trailing[content]
 
     return patterns
 
@@ -107,18 +115,34 @@ def detect_injected_content(
 def strip_injected_content(
     files: dict[str, RecoverableFile],
     patterns: list[InjectedContentPattern],
+    ops_by_pattern: dict[str, list[FileOperation]] | None = None,
 ) -> int:
     """Strip detected injected content from Read op content fields.
 
     Mutates op.content in-place for all affected Read ops.
     Returns the total number of ops modified.
+
+    ops_by_pattern, as filled by detect_injected_content on these files with
+    their content unchanged since, limits stripping to the listed ops instead
+    of re-extracting the trailing block of every Read op in files.
     """
     if not patterns:
         return 0
 
-    pattern_strings = {p.content for p in patterns}
     modified = 0
 
+    if ops_by_pattern is not None:
+        for p in patterns:
+            for op in ops_by_pattern.get(p.pattern_id, ()):
+                # Remove the trailing block from op.content
+                idx = op.content.rfind(p.content) if op.content else -1
+                if idx >= 0:
+                    op.content = op.content[:idx].rstrip()
+                    modified += 1
+        return modified
+
+    pattern_strings = {p.content for p in patterns}
+
     for rf in files.values():
         for op in rf.operations:
             if op.type != OpType.READ or not op.content:
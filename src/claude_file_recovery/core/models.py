@@ -2,17 +2,32 @@ from __future__ import annotations
 
 import enum
 from dataclasses import dataclass, field
+from operator import attrgetter
 
 
-class OpType(enum.Enum):
-    WRITE_CREATE = "write_create"
-    WRITE_UPDATE = "write_update"
-    EDIT = "edit"
-    READ = "read"
-    FILE_HISTORY = "file_history"
+class OpType(enum.IntEnum):
+    WRITE_CREATE = 0
+    WRITE_UPDATE = 1
+    EDIT = 2
+    READ = 3
+    FILE_HISTORY = 4
 
+    @property
+    def label(self) -> str:
+        """Snake-case name, e.g. 'write_create'."""
+        return _OP_TYPE_NAMES[self]
+
+
+# Indexed by OpType value
+_OP_TYPE_NAMES = ("write_create", "write_update", "edit", "read", "file_history")
+
+# RecoverableFile op-type bits that always carry full file content
+_FULL_CONTENT_MASK = (
+    (1 << OpType.WRITE_CREATE) | (1 << OpType.WRITE_UPDATE) | (1 << OpType.FILE_HISTORY)
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class FileOperation:
     """A single file-mutating or file-reading operation extracted from JSONL."""
 
@@ -47,17 +62,63 @@ class FileOperation:
     source_path: str | None = None  # Set during symlink merge for ops from alias paths
 
 
-@dataclass
+# Timeline order: by timestamp across sessions, by JSONL line within a session
+OP_SORT_KEY = attrgetter("timestamp", "session_id", "line_number")
+
+
+@dataclass(slots=True)
 class RecoverableFile:
-    """A file that can be recovered, with all its operations across sessions."""
+    """A file that can be recovered, with all its operations across sessions.
+
+    Derived summaries are computed by ``finalize()`` rather than on every
+    access. Call it again after mutating ``operations`` in place.
+    """
 
     path: str  # Absolute path
     operations: list[FileOperation] = field(default_factory=list)
+    # Operation timestamps in operations order, for bisecting by time
+    timestamps: list[str] = field(default_factory=list, init=False, repr=False)
+    # Bit (1 << op.type) is set for every op type present
+    _op_type_mask: int = field(default=0, init=False, repr=False)
+    _has_full_read: bool = field(default=False, init=False, repr=False)
+    _op_type_summary: str = field(default="", init=False, repr=False)
+    _latest_timestamp: str = field(default="", init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.finalize()
+
+    def finalize(self) -> None:
+        """Recompute cached summaries from the current operations list."""
+        type_counts = [0] * len(OpType)
+        has_full_read = False
+        for op in self.operations:
+            type_counts[op.type] += 1
+            if (
+                op.type == OpType.READ
+                and op.read_offset is None
+                and op.read_limit is None
+            ):
+                has_full_read = True
+
+        mask = 0
+        counts: dict[str, int] = {}
+        for op_type, n in enumerate(type_counts):
+            if n:
+                mask |= 1 << op_type
+                key = _OP_TYPE_NAMES[op_type].split("_")[0]  # write, edit, read, file
+                counts[key] = counts.get(key, 0) + n
+        self.timestamps = [op.timestamp for op in self.operations]
+        self._latest_timestamp = max(self.timestamps) if self.timestamps else ""
+        self._op_type_mask = mask
+        self._has_full_read = has_full_read
+        self._op_type_summary = ", ".join(
+            f"{v} {k}{'s' if v != 1 else ''}" for k, v in sorted(counts.items())
+        )
 
     @property
     def latest_timestamp(self) -> str:
         """Most recent operation timestamp."""
-        return max(op.timestamp for op in self.operations) if self.operations else ""
+        return self._latest_timestamp
 
     @property
     def operation_count(self) -> int:
@@ -66,34 +127,15 @@ class RecoverableFile:
     @property
     def has_full_content(self) -> bool:
         """Whether full file recovery is possible (has a Write, full Read, or file-history, not just Edits/partial Reads)."""
-        for op in self.operations:
-            if op.type in (
-                OpType.WRITE_CREATE,
-                OpType.WRITE_UPDATE,
-                OpType.FILE_HISTORY,
-            ):
-                return True
-            if (
-                op.type == OpType.READ
-                and op.read_offset is None
-                and op.read_limit is None
-            ):
-                return True
-        return False
+        return bool(self._op_type_mask & _FULL_CONTENT_MASK) or self._has_full_read
 
     @property
     def op_type_summary(self) -> str:
         """e.g., '3 writes, 5 edits, 2 reads'"""
-        counts: dict[str, int] = {}
-        for op in self.operations:
-            key = op.type.value.split("_")[0]  # write, edit, read, file
-            counts[key] = counts.get(key, 0) + 1
-        return ", ".join(
-            f"{v} {k}{'s' if v != 1 else ''}" for k, v in sorted(counts.items())
-        )
+        return self._op_type_summary
 
 
-@dataclass
+@dataclass(slots=True)
 class InjectedContentPattern:
     """A detected pattern of injected content found across multiple Read operations."""
 
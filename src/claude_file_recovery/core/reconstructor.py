@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import bisect
+from dataclasses import dataclass
+from typing import Iterator
 
 from claude_file_recovery.core.models import FileOperation, OpType, RecoverableFile
 
@@ -20,6 +22,91 @@ def apply_edit(
     return content.replace(old_string, new_string, 1)
 
 
+def _splice_position(
+    content: str, splices: list[tuple[int, int, str]], old_string: str
+) -> int | None:
+    """Locate old_string's first match as if pending splices were already applied.
+
+    Returns the match offset in ``content`` coordinates, or None when the answer
+    can't be derived without materializing the spliced string: no match in the
+    base content, a match overlapping an earlier replacement, or a possible
+    earlier match that runs into replacement text.
+    """
+    pos = content.find(old_string)
+    if pos < 0:
+        return None
+    end = pos + len(old_string)
+    # Splices are sorted and non-overlapping, so [:before] all start before `end`
+    before = bisect.bisect_left(splices, (end,))
+    if before and splices[before - 1][1] > pos:
+        return None
+    # Any earlier match must touch replacement text; check a window of
+    # len(old_string) - 1 unchanged characters either side of each one.
+    ctx = len(old_string) - 1
+    prev_end = 0
+    for k in range(before):
+        start, stop, replacement = splices[k]
+        if start - ctx < prev_end or (
+            k + 1 < len(splices) and stop + ctx > splices[k + 1][0]
+        ):
+            return None
+        window = content[max(0, start - ctx) : start] + replacement
+        if old_string in window + content[stop : stop + ctx]:
+            return None
+        prev_end = stop
+    return pos
+
+
+def _apply_splices(content: str, splices: list[tuple[int, int, str]]) -> str:
+    parts = []
+    prev = 0
+    for start, stop, replacement in splices:
+        parts.append(content[prev:start])
+        parts.append(replacement)
+        prev = stop
+    parts.append(content[prev:])
+    return "".join(parts)
+
+
+def apply_edits(content: str, edits: list[FileOperation]) -> str:
+    """Apply a run of Edit operations in order, as repeated apply_edit() calls would.
+
+    Single replacements that land on untouched text are collected as splices
+    against the starting content and applied in one rebuild pass, instead of
+    copying the whole file once per edit. replace_all edits, misses and matches
+    that interact with earlier replacements flush pending splices and fall back
+    to a plain search on the materialized content.
+    """
+    splices: list[tuple[int, int, str]] = []
+    for op in edits:
+        old_string, new_string = op.old_string, op.new_string
+        if not old_string or new_string is None:
+            continue
+        if splices and not op.replace_all:
+            pos = _splice_position(content, splices, old_string)
+            if pos is not None:
+                bisect.insort(splices, (pos, pos + len(old_string), new_string))
+                continue
+        if splices:
+            content = _apply_splices(content, splices)
+            splices = []
+        if op.replace_all:
+            content = content.replace(old_string, new_string)
+            continue
+        pos = content.find(old_string)
+        if pos >= 0:
+            splices.append((pos, pos + len(old_string), new_string))
+    return _apply_splices(content, splices) if splices else content
+
+
+def _line_offset(text: str, line: int) -> int:
+    """Return the character offset at which 0-based line ``line`` starts in text."""
+    pos = 0
+    for _ in range(line):
+        pos = text.index("\n", pos) + 1
+    return pos
+
+
 def splice_read(
     existing: str | None,
     new_content: str,
@@ -30,95 +117,158 @@ def splice_read(
     """Splice partial Read content into existing content at the correct line positions.
 
     Uses response metadata (start_line, num_lines, total_lines) from toolUseResult.file
-    to position the new content. Extends the line array with empty lines when the file
-    is longer than existing content.
+    to position the new content. Pads with empty lines when the file is longer than
+    existing content. Works on line offsets within the string, so the unchanged head
+    and tail are copied once instead of being split into and joined from a list.
     """
-    new_lines = new_content.split("\n")
     start = (start_line - 1) if start_line else 0
+    new_count = new_content.count("\n") + 1
+
+    target_len = total_lines or (start + new_count)
+    if existing is None and target_len <= 0:
+        return new_content
+    text = existing or ""
+    line_count = text.count("\n") + 1
+    if line_count < target_len:
+        text += "\n" * (target_len - line_count)
+        line_count = target_len
+
+    # Same bounds a list slice assignment lines[start : start + new_count] would use
+    lo, hi, _ = slice(start, start + new_count).indices(line_count)
+    hi = max(hi, lo)
+
+    if lo == 0:
+        head = ""
+    elif lo == line_count:
+        head = text + "\n"
+    else:
+        head = text[: _line_offset(text, lo)]
+    tail = "" if hi == line_count else "\n" + text[_line_offset(text, hi) :]
+    return head + new_content + tail
+
+
+def _replay_write(content: str | None, op: FileOperation) -> str | None:
+    return op.content
 
-    if existing is None:
-        lines = [""] * (total_lines or (start + len(new_lines)))
+
+def _replay_read(content: str | None, op: FileOperation) -> str | None:
+    if op.content is None:
+        return content
+    # A read is full if neither request nor response metadata indicates a partial range.
+    # Response metadata (read_start_line etc.) wins when available; otherwise fall
+    # back to request params (read_offset / read_limit).
+    if op.read_start_line is not None:
+        is_full = op.read_start_line == 1 and op.read_num_lines == op.read_total_lines
     else:
-        lines = existing.split("\n")
-        target_len = total_lines or (start + len(new_lines))
-        if len(lines) < target_len:
-            lines.extend([""] * (target_len - len(lines)))
+        is_full = op.read_offset is None and op.read_limit is None
+    if is_full:
+        # Full read — always authoritative, like a Write
+        return op.content
+    # Partial read — splice into existing content, or initialize with splicing
+    # when it is the first op for this file.
+    # Use response metadata when available; fall back to request offset.
+    start_line = op.read_start_line or op.read_offset
+    return splice_read(
+        content,
+        op.content,
+        start_line,
+        op.read_num_lines,
+        op.read_total_lines,
+    )
+
+
+def _replay_file_history(content: str | None, op: FileOperation) -> str | None:
+    return op.content if op.content is not None else content
+
+
+# Per-type replay steps for everything except Edit, which is applied in runs
+_REPLAY_HANDLERS = {
+    OpType.WRITE_CREATE: _replay_write,
+    OpType.WRITE_UPDATE: _replay_write,
+    OpType.READ: _replay_read,
+    OpType.FILE_HISTORY: _replay_file_history,
+}
 
-    lines[start : start + len(new_lines)] = new_lines
-    return "\n".join(lines)
+
+@dataclass(slots=True)
+class ReplayState:
+    """Where the last replay of one operations list stopped.
+
+    Passing the same state to successive reconstruct_file_at calls on that
+    list lets a step forward resume from here instead of replaying from the
+    first operation. Owners should drop it if the operations are mutated.
+    """
+
+    index: int = -1
+    content: str | None = None
 
 
 def reconstruct_file_at(
-    operations: list[FileOperation], up_to_index: int
+    operations: list[FileOperation],
+    up_to_index: int,
+    state: ReplayState | None = None,
 ) -> str | None:
     """Reconstruct file content at a specific point in the operation timeline.
 
     Replays all operations from index 0 through up_to_index (inclusive).
     Returns the file content at that point, or None if reconstruction fails.
+    If state records an earlier replay of the same list at or before
+    up_to_index, replay resumes from it; state is then updated in place.
     """
     content: str | None = None
 
-    for op in operations[: up_to_index + 1]:
-        if op.type in (OpType.WRITE_CREATE, OpType.WRITE_UPDATE):
-            content = op.content
-        elif op.type == OpType.READ:
-            if op.content is None:
-                continue
-            # A read is full if neither request nor response metadata indicates a partial range.
-            # Response metadata (read_start_line etc.) wins when available; otherwise fall
-            # back to request params (read_offset / read_limit).
-            if op.read_start_line is not None:
-                is_full = (
-                    op.read_start_line == 1 and op.read_num_lines == op.read_total_lines
-                )
-            else:
-                is_full = op.read_offset is None and op.read_limit is None
-            if is_full:
-                # Full read — always authoritative, like a Write
-                content = op.content
-            elif content is None:
-                # First op for this file is a partial read — initialize with splicing.
-                # Use response metadata when available; fall back to request offset.
-                start_line = op.read_start_line or op.read_offset
-                content = splice_read(
-                    None,
-                    op.content,
-                    start_line,
-                    op.read_num_lines,
-                    op.read_total_lines,
-                )
-            else:
-                # Partial read — splice into existing content.
-                # Use response metadata when available; fall back to request offset.
-                start_line = op.read_start_line or op.read_offset
-                content = splice_read(
-                    content,
-                    op.content,
-                    start_line,
-                    op.read_num_lines,
-                    op.read_total_lines,
-                )
-        elif op.type == OpType.FILE_HISTORY:
-            if op.content is not None:
-                content = op.content
-        elif op.type == OpType.EDIT:
-            # Prefer original_file (authoritative pre-edit state from toolUseResult)
-            # over current content, which may be stale or from a partial Read.
-            if op.original_file is not None:
-                content = op.original_file
-            # Apply the edit
-            if (
-                content is not None
-                and op.old_string is not None
-                and op.new_string is not None
-            ):
-                content = apply_edit(
-                    content, op.old_string, op.new_string, op.replace_all
-                )
+    ops = operations[: up_to_index + 1]
+    i = 0
+    if state is not None and 0 <= state.index < len(ops):
+        i = state.index + 1
+        content = state.content
+    while i < len(ops):
+        op = ops[i]
+        i += 1
+        if op.type != OpType.EDIT:
+            content = _REPLAY_HANDLERS[op.type](content, op)
+            continue
+        # Prefer original_file (authoritative pre-edit state from toolUseResult)
+        # over current content, which may be stale or from a partial Read.
+        if op.original_file is not None:
+            content = op.original_file
+        if content is None:
+            continue
+        # Apply this edit together with the run of plain edits that follows it
+        run_end = i
+        while (
+            run_end < len(ops)
+            and ops[run_end].type == OpType.EDIT
+            and ops[run_end].original_file is None
+        ):
+            run_end += 1
+        content = apply_edits(content, ops[i - 1 : run_end])
+        i = run_end
 
+    if state is not None:
+        state.index = len(ops) - 1
+        state.content = content
     return content
 
 
+def iter_file_states(operations: list[FileOperation]) -> Iterator[str | None]:
+    """Yield the file content after each operation, in one forward pass.
+
+    The k-th value equals reconstruct_file_at(operations, k), but the whole
+    timeline costs a single replay instead of one per index.
+    """
+    content: str | None = None
+    for op in operations:
+        if op.type != OpType.EDIT:
+            content = _REPLAY_HANDLERS[op.type](content, op)
+        else:
+            if op.original_file is not None:
+                content = op.original_file
+            if content is not None:
+                content = apply_edits(content, [op])
+        yield content
+
+
 def reconstruct_latest(file: RecoverableFile) -> str | None:
     """Reconstruct the latest version of a file."""
     if not file.operations:
@@ -129,14 +279,13 @@ def reconstruct_latest(file: RecoverableFile) -> str | None:
 def reconstruct_at_timestamp(file: RecoverableFile, before_ts: str) -> str | None:
     """Reconstruct file content at a specific point in time.
 
-    Finds the last operation where op.timestamp <= before_ts using bisect,
-    then delegates to reconstruct_file_at(). Returns None if no operations
-    qualify (all ops are after the cutoff).
+    Finds the last operation where op.timestamp <= before_ts by bisecting the
+    file's cached timestamps, then delegates to reconstruct_file_at(). Returns
+    None if no operations qualify (all ops are after the cutoff).
     """
     if not file.operations:
         return None
-    timestamps = [op.timestamp for op in file.operations]
-    idx = bisect.bisect_right(timestamps, before_ts) - 1
+    idx = bisect.bisect_right(file.timestamps, before_ts) - 1
     if idx < 0:
         return None
     return reconstruct_file_at(file.operations, idx)
@@ -1,37 +1,72 @@
 from __future__ import annotations
 
+import heapq
+import mmap
+import multiprocessing
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import BinaryIO
 
 import orjson
 
-from claude_file_recovery.core.models import FileOperation, OpType, RecoverableFile
+from claude_file_recovery.core.models import (
+    OP_SORT_KEY,
+    FileOperation,
+    OpType,
+    RecoverableFile,
+)
 from claude_file_recovery.core.reconstructor import apply_edit, splice_read
 
 
+def _walk_jsonl_files(directory: str, out: list[Path]) -> None:
+    """Collect session files under directory, top-down, without following symlinks."""
+    try:
+        it = os.scandir(directory)
+    except OSError:
+        return
+    subdirs: list[str] = []
+    with it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(".jsonl") or ".jsonl.backup" in entry.name:
+                out.append(Path(entry.path))
+    for subdir in subdirs:
+        _walk_jsonl_files(subdir, out)
+
+
 def discover_jsonl_files(backup_dir: Path) -> list[Path]:
     """Find all session JSONL files including subagent files.
 
     Walks projects/<slug>/*.jsonl (including .jsonl.backup.*) and
     projects/<slug>/<session>/subagents/*.jsonl.
     """
-    projects_dir = backup_dir / "projects"
-    if not projects_dir.exists():
-        return []
-
     jsonl_files: list[Path] = []
-    for root, dirs, files in os.walk(projects_dir):
-        for f in files:
-            if f.endswith(".jsonl") or ".jsonl.backup" in f:
-                jsonl_files.append(Path(root) / f)
+    _walk_jsonl_files(str(backup_dir / "projects"), jsonl_files)
     return jsonl_files
 
 
+# str(Path) uses the native separator, so match the directory with it too
+_SUBAGENTS_DIR = f"{os.sep}subagents{os.sep}"
+
+
 def _is_subagent_file(path: Path) -> bool:
     """Check if a JSONL file is a subagent file (in a subagents/ directory)."""
-    return "subagents" in path.parts
+    return _SUBAGENTS_DIR in f"{os.sep}{path}{os.sep}"
 
 
 def _extract_session_id(path: Path) -> str:
@@ -39,10 +74,11 @@ def _extract_session_id(path: Path) -> str:
     # Main session: projects/<slug>/<uuid>.jsonl
     # Backup: projects/<slug>/<uuid>.jsonl.backup.<timestamp>
     # Subagent: projects/<slug>/<uuid>/subagents/agent-<hex>.jsonl
-    if _is_subagent_file(path):
+    padded = f"{os.sep}{path}{os.sep}"
+    idx = padded.find(_SUBAGENTS_DIR)
+    if idx >= 0:
         # The session UUID is the parent of 'subagents' directory
-        idx = path.parts.index("subagents")
-        return path.parts[idx - 1]
+        return padded[:idx].rsplit(os.sep, 1)[-1]
     # Split on ".jsonl" to handle both uuid.jsonl and uuid.jsonl.backup.TS
     return path.name.split(".jsonl")[0]
 
@@ -53,15 +89,11 @@ def strip_read_line_numbers(text: str) -> str:
     Format: right-aligned number + → (U+2192) + content
     Example: '     1→first line'
     """
-    lines = text.split("\n")
     stripped = []
-    for line in lines:
-        # Match: optional whitespace + digits + → + rest
-        m = re.match(r"^\s*\d+\u2192(.*)", line)
-        if m:
-            stripped.append(m.group(1))
-        else:
-            stripped.append(line)
+    for line in text.split("\n"):
+        # Prefix before the first arrow must be optional whitespace + digits
+        head, arrow, rest = line.partition("\u2192")
+        stripped.append(rest if arrow and head.lstrip().isdecimal() else line)
     return "\n".join(stripped)
 
 
@@ -171,7 +203,7 @@ def _filter_noop_edits_by_replay(
 
 
 def _enrich_from_tool_use_result(
-    result: dict, pending_ops: dict[str, FileOperation]
+    result: dict, latest_by_path: dict[str, FileOperation]
 ) -> None:
     """Enrich a pending FileOperation with data from toolUseResult.
 
@@ -188,14 +220,8 @@ def _enrich_from_tool_use_result(
     if not file_path:
         return
 
-    # Find the matching pending op by filePath.
     # Match the most recent pending op for this path.
-    matching_op = None
-    for op in reversed(list(pending_ops.values())):
-        if op.file_path == file_path:
-            matching_op = op
-            break
-
+    matching_op = latest_by_path.get(file_path)
     if not matching_op:
         return
 
@@ -232,254 +258,478 @@ def _enrich_from_tool_use_result(
                 matching_op.read_total_lines = total_lines
 
 
-def scan_session(path: Path, backup_dir: Path | None = None) -> list[FileOperation]:
-    """Scan a single JSONL session file for file operations.
+# Session files below this size are read with the regular line iterator
+_MMAP_MIN_BYTES = 64 * 1024
 
-    Extracts both metadata (file path, timestamp, type) and content
-    (toolUseResult fields for Write/Edit, inline content for Read).
-    When backup_dir is provided, also parses file-history-snapshot entries
-    and reads corresponding disk files from file-history/<session-id>/.
+
+def _read_session_buffer(f: BinaryIO) -> bytes | mmap.mmap:
+    """Load a session file opened in binary mode as one searchable buffer.
+
+    Large files are memory-mapped so their pages come straight from the OS
+    cache; small ones (and files that can't be mapped) are read into bytes.
     """
-    ops: list[FileOperation] = []
-    # Map tool_use_id -> FileOperation for correlating with toolUseResult
-    pending_ops: dict[str, FileOperation] = {}
-    is_subagent = _is_subagent_file(path)
-    session_id = _extract_session_id(path)
+    if os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            pass
+    return f.read()
+
+
+# A line must contain one of these to yield or enrich a FileOperation
+_INTEREST_MARKERS = (
+    b'"tool_use"',
+    b'"tool_result"',
+    b'"toolUseResult"',
+    b'"file-history-snapshot"',
+)
+
+
+# Progress entry markers for compact and spaced (": ") JSON writers
+_PROGRESS_COMPACT = b'"type":"progress"'
+_PROGRESS_SPACED = b'"type": "progress"'
+
+# Used to tell which of the two writers produced a session file
+_TYPE_KEY = b'"type"'
+_TYPE_KEY_SPACED = b'"type": '
+
+
+def _op_from_tool_use(
+    block: dict,
+    timestamp: str,
+    session_id: str,
+    is_subagent: bool,
+    line_num: int,
+) -> FileOperation | None:
+    """Build a FileOperation from a Write/Edit/Read tool_use block, or None for other tools."""
+    name = block.get("name")
+    if name not in ("Write", "Edit", "Read"):
+        return None
+    inp = block.get("input", {})
+    file_path = inp.get("file_path", "")
+    if not file_path:
+        return None
+
+    if name == "Write":
+        return FileOperation(
+            type=OpType.WRITE_CREATE,  # Refined from toolUseResult
+            file_path=file_path,
+            timestamp=timestamp,
+            session_id=session_id,
+            content=inp.get("content"),  # Fallback content from input
+            tool_use_id=block.get("id"),
+            is_subagent=is_subagent,
+            line_number=line_num,
+        )
+    if name == "Edit":
+        return FileOperation(
+            type=OpType.EDIT,
+            file_path=file_path,
+            timestamp=timestamp,
+            session_id=session_id,
+            old_string=inp.get("old_string"),
+            new_string=inp.get("new_string"),
+            replace_all=inp.get("replace_all", False),
+            tool_use_id=block.get("id"),
+            is_subagent=is_subagent,
+            line_number=line_num,
+        )
+    return FileOperation(
+        type=OpType.READ,
+        file_path=file_path,
+        timestamp=timestamp,
+        session_id=session_id,
+        read_offset=inp.get("offset"),
+        read_limit=inp.get("limit"),
+        tool_use_id=block.get("id"),
+        is_subagent=is_subagent,
+        line_number=line_num,
+    )
+
+
+@dataclass(slots=True)
+class _SessionState:
+    """Per-file state threaded through the entry handlers of scan_session."""
+
+    session_id: str
+    is_subagent: bool
+    backup_dir: Path | None
     cwd: str | None = None  # Populated from first entry with cwd field
+    # Ops grouped by file path, in JSONL order
+    ops_by_path: dict[str, list[FileOperation]] = field(default_factory=dict)
+    # One shared string object per distinct path, so repeated ops on the same
+    # file don't each hold their own copy (and pickle once back to the parent)
+    seen_paths: dict[str, str] = field(default_factory=dict)
+    # Map tool_use_id -> FileOperation for correlating with toolUseResult
+    pending_ops: dict[str, FileOperation] = field(default_factory=dict)
+    # Most recently registered pending op per file path, for toolUseResult matching
+    latest_pending_by_path: dict[str, FileOperation] = field(default_factory=dict)
 
-    with open(path, "rb") as f:
-        for line_num, line in enumerate(f, 1):
+    def add(self, op: FileOperation) -> None:
+        op.file_path = self.seen_paths.setdefault(op.file_path, op.file_path)
+        self.ops_by_path.setdefault(op.file_path, []).append(op)
+
+
+def _handle_assistant_entry(
+    state: _SessionState, entry: dict, timestamp: str, line_num: int
+) -> None:
+    msg = entry.get("message")
+    msg_content = msg.get("content") if isinstance(msg, dict) else None
+    if not isinstance(msg_content, list):
+        return
+    # Scan for Write/Edit/Read tool_use blocks
+    for block in msg_content:
+        if block.get("type") != "tool_use":
+            continue
+        op = _op_from_tool_use(
+            block, timestamp, state.session_id, state.is_subagent, line_num
+        )
+        if op is None:
+            continue
+        state.add(op)
+        if op.tool_use_id:
+            state.pending_ops[op.tool_use_id] = op
+            state.latest_pending_by_path[op.file_path] = op
+
+
+def _handle_user_entry(
+    state: _SessionState, entry: dict, timestamp: str, line_num: int
+) -> None:
+    msg = entry.get("message")
+    msg_content = msg.get("content") if isinstance(msg, dict) else None
+    # Extract content from toolUseResult (top-level field)
+    tool_result = entry.get("toolUseResult")
+    if isinstance(tool_result, dict) and tool_result:
+        # Resolve externalized tool output if present
+        persisted_path = tool_result.get("persistedOutputPath")
+        if persisted_path:
+            try:
+                full_content = Path(persisted_path).read_text(
+                    encoding="utf-8", errors="replace"
+                )
+                tool_result["stdout"] = full_content
+            except (OSError, IOError):
+                pass  # Keep truncated content if file not found
+
+        _enrich_from_tool_use_result(tool_result, state.latest_pending_by_path)
+
+    # Also detect errors from top-level toolUseResult string
+    if isinstance(tool_result, str) and tool_result.startswith("Error: "):
+        # Match to most recent pending op by tool_use_id in content
+        tool_use_id_from_content = None
+        if isinstance(msg_content, list):
+            for b in msg_content:
+                if isinstance(b, dict) and b.get("type") == "tool_result":
+                    tool_use_id_from_content = b.get("tool_use_id")
+                    break
+        if tool_use_id_from_content and tool_use_id_from_content in state.pending_ops:
+            err_op = state.pending_ops[tool_use_id_from_content]
+            err_op.is_error = True
+            err_op.error_message = tool_result[len("Error: ") :]
+
+    # Extract content and detect errors from message.content tool_result blocks
+    if isinstance(msg_content, list):
+        for block in msg_content:
+            if not isinstance(block, dict):
+                continue
+            if block.get("type") == "tool_result":
+                tool_use_id = block.get("tool_use_id")
+                # Resolve persisted output in tool_result content
+                block_content = block.get("content", "")
+                if (
+                    isinstance(block_content, str)
+                    and block_content.startswith("<persisted-output>")
+                    and isinstance(tool_result, dict)
+                    and tool_result.get("persistedOutputPath")
+                ):
+                    try:
+                        full_content = Path(
+                            tool_result["persistedOutputPath"]
+                        ).read_text(encoding="utf-8", errors="replace")
+                        block["content"] = full_content
+                    except (OSError, IOError):
+                        pass  # Keep truncated content
+
+                if tool_use_id and tool_use_id in state.pending_ops:
+                    op = state.pending_ops[tool_use_id]
+                    if block.get("is_error"):
+                        op.is_error = True
+                        raw = block.get("content", "")
+                        if isinstance(raw, str):
+                            m = re.match(
+                                r"<tool_use_error>(.*)</tool_use_error>",
+                                raw,
+                                re.DOTALL,
+                            )
+                            op.error_message = m.group(1).strip() if m else raw.strip()
+                    elif op.type == OpType.READ and op.content is None:
+                        raw = block.get("content", "")
+                        if isinstance(raw, str) and "\u2192" in raw:
+                            op.content = strip_read_line_numbers(raw)
+                        elif isinstance(raw, str):
+                            op.content = raw
+
+
+def _handle_file_history_entry(
+    state: _SessionState, entry: dict, timestamp: str, line_num: int
+) -> None:
+    if state.backup_dir is None:
+        return
+    snapshot = entry.get("snapshot", {})
+    tracked = snapshot.get("trackedFileBackups", {})
+    for rel_path, backup_info in tracked.items():
+        backup_filename = backup_info.get("backupFileName")
+        backup_time = backup_info.get("backupTime", timestamp)
+        if not backup_filename:
+            continue
+
+        # Resolve relative path to absolute using session cwd
+        if state.cwd and not os.path.isabs(rel_path):
+            abs_path = os.path.normpath(os.path.join(state.cwd, rel_path))
+        else:
+            abs_path = rel_path
+
+        # Read the snapshot file from disk
+        snapshot_file = (
+            state.backup_dir / "file-history" / state.session_id / backup_filename
+        )
+        try:
+            file_content = snapshot_file.read_text(encoding="utf-8", errors="replace")
+        except (OSError, IOError):
+            continue  # Skip if file doesn't exist or can't be read
+
+        op = FileOperation(
+            type=OpType.FILE_HISTORY,
+            file_path=abs_path,
+            timestamp=backup_time,
+            session_id=state.session_id,
+            content=file_content,
+            line_number=line_num,
+        )
+        state.add(op)
+
+
+_ENTRY_HANDLERS = {
+    "assistant": _handle_assistant_entry,
+    "user": _handle_user_entry,
+    "file-history-snapshot": _handle_file_history_entry,
+}
+
+
+def _scan_buffer(state: _SessionState, buf: bytes | mmap.mmap) -> None:
+    """Run the per-line rejects and entry handlers over a whole session buffer.
+
+    Lines are addressed by offsets into buf: the byte-marker rejects search
+    within [start, end) bounds, and only lines that survive them are handed
+    to orjson as a zero-copy memoryview slice.
+    """
+    find = buf.find
+    size = len(buf)
+    # Marker constants bound to locals for the per-line loop
+    type_key, type_key_spaced = _TYPE_KEY, _TYPE_KEY_SPACED
+    tool_use, tool_result, tool_use_result, snapshot = _INTEREST_MARKERS
+    # Picked from the first line with a type key: one writer produces a file,
+    # so only its spelling needs searching. A miss only costs a parse.
+    progress_marker: bytes | None = None
+
+    with memoryview(buf) as view:
+        start = 0
+        line_num = 0
+        while start < size:
+            end = find(b"\n", start)
+            if end < 0:
+                end = size
+            line_start, start = start, end + 1
+            line_num += 1
+
+            if progress_marker is None and find(type_key, line_start, end) >= 0:
+                progress_marker = (
+                    _PROGRESS_SPACED
+                    if find(type_key_spaced, line_start, end) >= 0
+                    else _PROGRESS_COMPACT
+                )
             # Fast reject: 77% of lines are progress entries
-            if b'"type":"progress"' in line or b'"type": "progress"' in line:
+            if (
+                progress_marker is not None
+                and find(progress_marker, line_start, end) >= 0
+            ):
+                continue
+            # Once cwd is known, only lines carrying tool calls, tool results or
+            # file-history snapshots can contribute; skip parsing the rest.
+            if (
+                state.cwd is not None
+                and find(tool_use, line_start, end) < 0
+                and find(tool_result, line_start, end) < 0
+                and find(tool_use_result, line_start, end) < 0
+                and find(snapshot, line_start, end) < 0
+            ):
                 continue
             try:
-                entry = orjson.loads(line)
+                entry = orjson.loads(view[line_start:end])
             except orjson.JSONDecodeError:
                 continue
 
-            entry_type = entry.get("type")
-            timestamp = entry.get("timestamp", "")
-
             # Track cwd for resolving relative paths in file-history snapshots
-            if cwd is None:
+            if state.cwd is None:
                 entry_cwd = entry.get("cwd")
                 if entry_cwd:
-                    cwd = entry_cwd
-
-            if entry_type == "assistant":
-                # Scan for Write/Edit/Read tool_use blocks
-                for block in entry.get("message", {}).get("content", []):
-                    if block.get("type") != "tool_use":
-                        continue
-                    name = block.get("name")
-                    inp = block.get("input", {})
-                    file_path = inp.get("file_path", "")
-
-                    if not file_path:
-                        continue
-
-                    if name == "Write":
-                        op = FileOperation(
-                            type=OpType.WRITE_CREATE,  # Refined from toolUseResult
-                            file_path=file_path,
-                            timestamp=timestamp,
-                            session_id=session_id,
-                            content=inp.get("content"),  # Fallback content from input
-                            tool_use_id=block.get("id"),
-                            is_subagent=is_subagent,
-                            line_number=line_num,
-                        )
-                        ops.append(op)
-                        if op.tool_use_id:
-                            pending_ops[op.tool_use_id] = op
-                    elif name == "Edit":
-                        op = FileOperation(
-                            type=OpType.EDIT,
-                            file_path=file_path,
-                            timestamp=timestamp,
-                            session_id=session_id,
-                            old_string=inp.get("old_string"),
-                            new_string=inp.get("new_string"),
-                            replace_all=inp.get("replace_all", False),
-                            tool_use_id=block.get("id"),
-                            is_subagent=is_subagent,
-                            line_number=line_num,
-                        )
-                        ops.append(op)
-                        if op.tool_use_id:
-                            pending_ops[op.tool_use_id] = op
-                    elif name == "Read":
-                        op = FileOperation(
-                            type=OpType.READ,
-                            file_path=file_path,
-                            timestamp=timestamp,
-                            session_id=session_id,
-                            read_offset=inp.get("offset"),
-                            read_limit=inp.get("limit"),
-                            tool_use_id=block.get("id"),
-                            is_subagent=is_subagent,
-                            line_number=line_num,
-                        )
-                        ops.append(op)
-                        if op.tool_use_id:
-                            pending_ops[op.tool_use_id] = op
-
-            elif entry_type == "user":
-                # Extract content from toolUseResult (top-level field)
-                tool_result = entry.get("toolUseResult")
-                if isinstance(tool_result, dict) and tool_result:
-                    # Resolve externalized tool output if present
-                    persisted_path = tool_result.get("persistedOutputPath")
-                    if persisted_path:
-                        try:
-                            full_content = Path(persisted_path).read_text(
-                                encoding="utf-8", errors="replace"
-                            )
-                            tool_result["stdout"] = full_content
-                        except (OSError, IOError):
-                            pass  # Keep truncated content if file not found
-
-                    _enrich_from_tool_use_result(tool_result, pending_ops)
-
-                # Also detect errors from top-level toolUseResult string
-                if isinstance(tool_result, str) and tool_result.startswith("Error: "):
-                    # Match to most recent pending op by tool_use_id in content
-                    tool_use_id_from_content = None
-                    msg_content_err = entry.get("message", {}).get("content", [])
-                    if isinstance(msg_content_err, list):
-                        for b in msg_content_err:
-                            if isinstance(b, dict) and b.get("type") == "tool_result":
-                                tool_use_id_from_content = b.get("tool_use_id")
-                                break
-                    if (
-                        tool_use_id_from_content
-                        and tool_use_id_from_content in pending_ops
-                    ):
-                        err_op = pending_ops[tool_use_id_from_content]
-                        err_op.is_error = True
-                        err_op.error_message = tool_result[len("Error: ") :]
-
-                # Extract content and detect errors from message.content tool_result blocks
-                msg_content = entry.get("message", {}).get("content", [])
-                if isinstance(msg_content, list):
-                    for block in msg_content:
-                        if not isinstance(block, dict):
-                            continue
-                        if block.get("type") == "tool_result":
-                            tool_use_id = block.get("tool_use_id")
-                            # Resolve persisted output in tool_result content
-                            block_content = block.get("content", "")
-                            if (
-                                isinstance(block_content, str)
-                                and block_content.startswith("<persisted-output>")
-                                and isinstance(tool_result, dict)
-                                and tool_result.get("persistedOutputPath")
-                            ):
-                                try:
-                                    full_content = Path(
-                                        tool_result["persistedOutputPath"]
-                                    ).read_text(encoding="utf-8", errors="replace")
-                                    block["content"] = full_content
-                                except (OSError, IOError):
-                                    pass  # Keep truncated content
-
-                            if tool_use_id and tool_use_id in pending_ops:
-                                op = pending_ops[tool_use_id]
-                                if block.get("is_error"):
-                                    op.is_error = True
-                                    raw = block.get("content", "")
-                                    if isinstance(raw, str):
-                                        m = re.match(
-                                            r"<tool_use_error>(.*)</tool_use_error>",
-                                            raw,
-                                            re.DOTALL,
-                                        )
-                                        op.error_message = (
-                                            m.group(1).strip() if m else raw.strip()
-                                        )
-                                elif op.type == OpType.READ and op.content is None:
-                                    raw = block.get("content", "")
-                                    if isinstance(raw, str) and "\u2192" in raw:
-                                        op.content = strip_read_line_numbers(raw)
-                                    elif isinstance(raw, str):
-                                        op.content = raw
-
-            elif entry_type == "file-history-snapshot" and backup_dir is not None:
-                snapshot = entry.get("snapshot", {})
-                tracked = snapshot.get("trackedFileBackups", {})
-                for rel_path, backup_info in tracked.items():
-                    backup_filename = backup_info.get("backupFileName")
-                    backup_time = backup_info.get("backupTime", timestamp)
-                    if not backup_filename:
-                        continue
-
-                    # Resolve relative path to absolute using session cwd
-                    if cwd and not os.path.isabs(rel_path):
-                        abs_path = os.path.normpath(os.path.join(cwd, rel_path))
-                    else:
-                        abs_path = rel_path
+                    state.cwd = entry_cwd
 
-                    # Read the snapshot file from disk
-                    snapshot_file = (
-                        backup_dir / "file-history" / session_id / backup_filename
-                    )
-                    try:
-                        file_content = snapshot_file.read_text(
-                            encoding="utf-8", errors="replace"
-                        )
-                    except (OSError, IOError):
-                        continue  # Skip if file doesn't exist or can't be read
-
-                    op = FileOperation(
-                        type=OpType.FILE_HISTORY,
-                        file_path=abs_path,
-                        timestamp=backup_time,
-                        session_id=session_id,
-                        content=file_content,
-                        line_number=line_num,
-                    )
-                    ops.append(op)
+            handler = _ENTRY_HANDLERS.get(entry.get("type"))
+            if handler is not None:
+                handler(state, entry, entry.get("timestamp", ""), line_num)
+
+
+def scan_session(
+    path: Path, backup_dir: Path | None = None
+) -> dict[str, list[FileOperation]]:
+    """Scan a single JSONL session file for file operations.
+
+    Extracts both metadata (file path, timestamp, type) and content
+    (toolUseResult fields for Write/Edit, inline content for Read).
+    When backup_dir is provided, also parses file-history-snapshot entries
+    and reads corresponding disk files from file-history/<session-id>/.
+
+    Returns the operations grouped by file path, each list in JSONL order.
+    """
+    state = _SessionState(
+        session_id=_extract_session_id(path),
+        is_subagent=_is_subagent_file(path),
+        backup_dir=backup_dir,
+    )
+
+    with open(path, "rb") as f:
+        buf = _read_session_buffer(f)
+    try:
+        _scan_buffer(state, buf)
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+    result: dict[str, list[FileOperation]] = {}
+    for file_path, path_ops in state.ops_by_path.items():
+        kept = [op for op in path_ops if not _is_noop_edit(op)]
+        if kept:
+            result[file_path] = kept
+    return result
+
+
+# Below this much session data, starting worker processes costs more than
+# parsing in parallel saves
+_PROCESS_POOL_MIN_BYTES = 32 * 1024 * 1024
 
-    return [op for op in ops if not _is_noop_edit(op)]
+
+def _scan_executor(max_workers: int, use_processes: bool, total_bytes: int) -> Executor:
+    """Process pool for parallel parsing when it can pay off, otherwise threads.
+
+    Processes are opt-in (workers re-import the caller's __main__, so scripts
+    need a main guard) and only used with more than one CPU and at least
+    _PROCESS_POOL_MIN_BYTES to parse. CLAUDE_RECOVERY_THREADS=1 forces threads.
+    """
+    cpus = os.cpu_count() or 1
+    if (
+        not use_processes
+        or max_workers == 1
+        or cpus == 1
+        or total_bytes < _PROCESS_POOL_MIN_BYTES
+        or os.environ.get("CLAUDE_RECOVERY_THREADS") == "1"
+    ):
+        return ThreadPoolExecutor(max_workers=max_workers)
+    # Not fork: callers such as the CLI progress display run threads, and
+    # forking a multi-threaded process can deadlock on locks they hold
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+    try:
+        return ProcessPoolExecutor(
+            max_workers=min(max_workers, cpus), mp_context=context
+        )
+    except (OSError, NotImplementedError, ValueError):
+        return ThreadPoolExecutor(max_workers=max_workers)
 
 
 def scan_all_sessions(
     backup_dir: Path,
     max_workers: int = 8,
     progress_callback=None,
+    max_session_bytes: int | None = None,
+    use_processes: bool = False,
+    skipped: list[Path] | None = None,
 ) -> dict[str, RecoverableFile]:
     """Scan all JSONL files and build a dict of recoverable files keyed by absolute path.
 
     Operations within each session are ordered by JSONL line number.
     Cross-session operations for the same file are ordered by timestamp.
+
+    Sessions are submitted smallest-first so progress moves quickly past the
+    many small files before the few large ones. Files larger than
+    max_session_bytes (when set) are not scanned; they are appended to
+    skipped, if given, for the caller to report.
+
+    With use_processes, large scans on multi-core machines parse sessions in
+    worker processes; the calling script must then guard its entry point with
+    ``if __name__ == "__main__":``.
     """
-    jsonl_files = discover_jsonl_files(backup_dir)
-    all_ops: list[FileOperation] = []
+    sized: list[tuple[int, Path]] = []
+    for path in discover_jsonl_files(backup_dir):
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        if max_session_bytes is not None and size > max_session_bytes:
+            if skipped is not None:
+                skipped.append(path)
+            continue
+        sized.append((size, path))
+    sized.sort(key=lambda item: item[0])
+    jsonl_files = [path for _, path in sized]
+    # Per file path, one timeline-sorted run of ops per session file
+    runs_by_path: dict[str, list[list[FileOperation]]] = {}
     completed = 0
     total = len(jsonl_files)
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(scan_session, p, backup_dir): p for p in jsonl_files}
+    def collect(executor: Executor, paths: list[Path]) -> None:
+        nonlocal completed
+        futures = {executor.submit(scan_session, p, backup_dir): p for p in paths}
         for future in as_completed(futures):
+            try:
+                session_runs = future.result()
+            except BrokenExecutor:
+                raise  # the pool died; the caller rescans what is left
+            except Exception:
+                session_runs = {}  # Skip malformed files
+            remaining.discard(futures[future])
             completed += 1
             if progress_callback:
                 progress_callback(completed, total)
-            try:
-                ops = future.result()
-                all_ops.extend(ops)
-            except Exception:
-                continue  # Skip malformed files
-
-    # Group by absolute file path
+            for file_path, run in session_runs.items():
+                # Already in line order; only out-of-order timestamps
+                # (e.g. file-history backup times) need real sorting work.
+                run.sort(key=OP_SORT_KEY)
+                runs_by_path.setdefault(file_path, []).append(run)
+
+    remaining = set(jsonl_files)
+    try:
+        total_bytes = sum(size for size, _ in sized)
+        with _scan_executor(max_workers, use_processes, total_bytes) as executor:
+            collect(executor, jsonl_files)
+    except BrokenExecutor:
+        # A worker process crashed or could not start: finish in-process
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            collect(executor, [p for p in jsonl_files if p in remaining])
+
+    # Merge the sorted runs: within same session by line_number, across
+    # sessions by timestamp
     files: dict[str, RecoverableFile] = {}
-    for op in all_ops:
-        if op.file_path not in files:
-            files[op.file_path] = RecoverableFile(path=op.file_path)
-        files[op.file_path].operations.append(op)
-
-    # Sort operations: within same session by line_number, across sessions by timestamp
-    for rf in files.values():
-        rf.operations.sort(key=lambda o: (o.timestamp, o.session_id, o.line_number))
-        rf.operations = _filter_noop_edits_by_replay(rf.operations)
+    for file_path, runs in runs_by_path.items():
+        # Most files are touched by a single session: its run is the timeline
+        if len(runs) == 1:
+            operations = runs[0]
+        else:
+            operations = list(heapq.merge(*runs, key=OP_SORT_KEY))
+        files[file_path] = RecoverableFile(
+            path=file_path, operations=_filter_noop_edits_by_replay(operations)
+        )
 
     return files
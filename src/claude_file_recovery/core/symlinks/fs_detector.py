@@ -2,26 +2,84 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import Iterator
 
 from claude_file_recovery.core.symlinks.models import SymlinkGroup
 
 
+def _path_parts(filepath: str) -> list[str]:
+    """Split a path like Path.parts, without building a Path for clean absolute paths."""
+    if (
+        filepath.startswith("/")
+        and "//" not in filepath
+        and "/./" not in filepath
+        and not filepath.endswith(("/", "/."))
+    ):
+        return ["/", *filepath[1:].split("/")]
+    return list(Path(filepath).parts)
+
+
+def _path_prefixes(filepath: str) -> Iterator[tuple[str, str]]:
+    """Yield (parent, prefix) for each component prefix below the root, top-down.
+
+    Prefixes are the same strings str(Path(*parts[: i + 1])) would produce.
+    """
+    parts = _path_parts(filepath)
+    if len(parts) < 2:
+        return
+    parent = parts[0]
+    prefix = os.path.join(parent, parts[1])
+    yield parent, prefix
+    sep = os.sep
+    for part in parts[2:]:
+        parent, prefix = prefix, prefix + sep + part
+        yield parent, prefix
+
+
+def _link_target(link: str) -> str:
+    """Resolve a symlink's target to a normalized absolute-or-relative path."""
+    target = os.readlink(link)
+    if not os.path.isabs(target):
+        target = str(Path(link).parent / target)
+    return os.path.normpath(target)
+
+
+def _prefetch_link_cache(file_paths: list[str], cache: dict[str, str | None]) -> None:
+    """Fill the symlink cache with one scandir per directory instead of per-path lstat.
+
+    Directories that cannot be listed, and names the listing does not contain
+    verbatim, are skipped; find_symlinks_in_path probes those individually.
+    """
+    wanted: dict[str, set[str]] = {}
+    for fp in file_paths:
+        for parent, prefix in _path_prefixes(fp):
+            if prefix not in cache:
+                wanted.setdefault(parent, set()).add(prefix)
+
+    for directory, prefixes in wanted.items():
+        try:
+            with os.scandir(directory) as it:
+                entries = [entry for entry in it if entry.path in prefixes]
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                cache[entry.path] = (
+                    _link_target(entry.path) if entry.is_symlink() else None
+                )
+            except OSError:
+                cache[entry.path] = None
+        # Names missing from the listing stay uncached: on a case- or
+        # normalization-insensitive filesystem they may still name an entry
+        # spelled differently on disk, so find_symlinks_in_path probes them
+
+
 def find_symlinks_in_path(filepath: str, cache: dict[str, str | None]) -> str | None:
     """Walk directory components from root down, return shallowest symlink or None."""
-    parts = Path(filepath).parts
-    for i in range(1, len(parts)):
-        prefix = str(Path(*parts[: i + 1]))
-
+    for _, prefix in _path_prefixes(filepath):
         if prefix not in cache:
             try:
-                if os.path.islink(prefix):
-                    target = os.readlink(prefix)
-                    if not os.path.isabs(target):
-                        target = str(Path(prefix).parent / target)
-                    target = os.path.normpath(target)
-                    cache[prefix] = target
-                else:
-                    cache[prefix] = None
+                cache[prefix] = _link_target(prefix) if os.path.islink(prefix) else None
             except OSError:
                 cache[prefix] = None
 
@@ -44,6 +102,7 @@ def detect_fs_symlinks(file_paths: list[str]) -> list[SymlinkGroup]:
     - detection_methods = {"<alias>": "FS"} for each alias
     """
     cache: dict[str, str | None] = {}
+    _prefetch_link_cache(file_paths, cache)
     # symlink_component_path -> {"target": resolved, "paths": [file_paths]}
     symlink_map: dict[str, dict] = {}
 
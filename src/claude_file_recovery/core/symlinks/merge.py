@@ -1,9 +1,21 @@
 from __future__ import annotations
 
-from claude_file_recovery.core.models import RecoverableFile
+import heapq
+
+from claude_file_recovery.core.models import (
+    OP_SORT_KEY,
+    FileOperation,
+    RecoverableFile,
+)
 from claude_file_recovery.core.symlinks.models import SymlinkGroup
 
 
+def _root_component(path: str) -> str:
+    """Return the first component of path, keeping the leading "/" if any."""
+    end = path.find("/", 1)
+    return path if end < 0 else path[:end]
+
+
 def merge_file_index(
     file_index: dict[str, RecoverableFile],
     groups: list[SymlinkGroup],
@@ -15,6 +27,9 @@ def merge_file_index(
     corresponding canonical-path entry (remapping the file path from
     alias to canonical), and sets source_path on ops from alias paths.
 
+    Each entry's operations must already be in timeline order (as produced
+    by scan_all_sessions); merged entries interleave them without re-sorting.
+
     Returns a new dict — the original file_index is not mutated.
     """
     # Build alias->canonical prefix mapping
@@ -23,38 +38,64 @@ def merge_file_index(
         for alias in group.aliases:
             alias_to_canonical[alias] = group.canonical
 
-    # Sort alias prefixes longest-first so we match the most specific alias
-    sorted_aliases = sorted(alias_to_canonical.keys(), key=len, reverse=True)
+    # Trie over "/"-separated path components; the None key marks the end of
+    # an alias. Walking a path down it finds the deepest (most specific)
+    # alias that equals the path or is a directory prefix of it.
+    alias_trie: dict = {}
+    for alias in alias_to_canonical:
+        node = alias_trie
+        for part in alias.split("/"):
+            node = node.setdefault(part, {})
+        node[None] = alias
+
+    # Leading components (root-level directory for absolute paths) of every
+    # alias; a path that starts anywhere else can't fall under any of them.
+    # An empty alias prefixes every absolute path, so it disables the check.
+    alias_roots = (
+        {_root_component(alias) for alias in alias_to_canonical}
+        if "" not in alias_to_canonical
+        else None
+    )
 
     def resolve_path(path: str) -> tuple[str, str | None]:
         """Resolve a path to its canonical form.
 
         Returns (canonical_path, original_alias_path_or_None).
         """
-        for alias in sorted_aliases:
-            if path == alias or path.startswith(alias + "/"):
-                canonical_prefix = alias_to_canonical[alias]
-                canonical_path = canonical_prefix + path[len(alias) :]
-                return canonical_path, path
-        return path, None
+        if alias_roots is not None and _root_component(path) not in alias_roots:
+            return path, None
+        node = alias_trie
+        matched = None
+        for part in path.split("/"):
+            node = node.get(part)
+            if node is None:
+                break
+            matched = node.get(None, matched)
+        if matched is None:
+            return path, None
+        canonical_prefix = alias_to_canonical[matched]
+        return canonical_prefix + path[len(matched) :], path
 
-    # Build new index
-    new_index: dict[str, RecoverableFile] = {}
+    # Collect each entry's (already timeline-sorted) operations per canonical path
+    runs_by_path: dict[str, list[list[FileOperation]]] = {}
 
     for path, rf in file_index.items():
         canonical_path, original_path = resolve_path(path)
-
-        if canonical_path not in new_index:
-            new_index[canonical_path] = RecoverableFile(path=canonical_path)
-
-        target = new_index[canonical_path]
-        for op in rf.operations:
-            if original_path is not None:
+        if original_path is not None:
+            for op in rf.operations:
                 op.source_path = original_path
-            target.operations.append(op)
-
-    # Re-sort operations in each merged entry
-    for rf in new_index.values():
-        rf.operations.sort(key=lambda o: (o.timestamp, o.session_id, o.line_number))
+        runs_by_path.setdefault(canonical_path, []).append(rf.operations)
 
-    return new_index
+    # Merge the sorted runs into each entry's timeline; unmerged entries
+    # just get a copy of their single run
+    return {
+        canonical_path: RecoverableFile(
+            path=canonical_path,
+            operations=(
+                list(runs[0])
+                if len(runs) == 1
+                else list(heapq.merge(*runs, key=OP_SORT_KEY))
+            ),
+        )
+        for canonical_path, runs in runs_by_path.items()
+    }
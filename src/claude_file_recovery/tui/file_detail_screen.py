@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from functools import lru_cache, partial
+from pathlib import Path
+
+from textual import work
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, VerticalScroll
 from textual.screen import Screen
+from textual.timer import Timer
+from textual.visual import Visual, visualize
 from textual.widgets import Footer, OptionList, Static
 from textual.widgets.option_list import Option
-
-from pathlib import Path
+from textual.worker import get_current_worker
 
 from claude_file_recovery.core.models import FileOperation, OpType, RecoverableFile
-from claude_file_recovery.core.reconstructor import reconstruct_file_at
+from claude_file_recovery.core.reconstructor import (
+    ReplayState,
+    iter_file_states,
+    reconstruct_file_at,
+)
 from claude_file_recovery.core.diff import (
     compute_before_after,
     format_diff_text,
@@ -20,6 +30,47 @@ from claude_file_recovery.core.diff import (
 from claude_file_recovery.core.timestamps import utc_to_local
 
 
+# Delay before rendering the preview for a newly highlighted snapshot
+_PREVIEW_DEBOUNCE_SECONDS = 0.05
+
+# Stop precomputing snapshots once they hold this many characters in total;
+# later snapshots are reconstructed on demand instead
+_SNAPSHOT_BUDGET_CHARS = 64 * 1024 * 1024
+
+# Rendered previews kept for revisits; the least recently shown is dropped
+_VIEW_CACHE_SIZE = 32
+
+
+# Title-cased operation names, e.g. "Write Update"
+_OP_DISPLAY_LABELS = {t: t.label.replace("_", " ").title() for t in OpType}
+
+
+@lru_cache(maxsize=1 << 16)
+def _snapshot_label(timestamp: str, op_type: OpType, is_error: bool) -> str:
+    """Return the timeline row text for an operation.
+
+    Cached at module level so reopening a file's detail screen reuses the
+    labels (and their local-time conversions) from the previous visit.
+    """
+    ts = utc_to_local(timestamp) if timestamp else "unknown"
+    op_label = _OP_DISPLAY_LABELS[op_type]
+    return f"{ts}  {op_label}  ✗" if is_error else f"{ts}  {op_label}"
+
+
+def _head_lines(text: str, n: int) -> tuple[str, int]:
+    """Return the first n lines of text and how many lines follow them.
+
+    Slices at the n-th newline instead of splitting the whole string.
+    """
+    pos = 0
+    for _ in range(n):
+        pos = text.find("\n", pos)
+        if pos < 0:
+            return text, 0
+        pos += 1
+    return text[: pos - 1], text.count("\n", pos) + 1
+
+
 class FileDetailScreen(Screen):
     """Split-pane: snapshot timeline (left) + file content preview (right)."""
 
@@ -38,17 +89,69 @@ class FileDetailScreen(Screen):
     def __init__(self, file: RecoverableFile):
         super().__init__()
         self.file = file
-        # Operations in reverse chronological order (newest first) for display
-        self._display_ops = list(reversed(file.operations))
+        # The operations list is fixed for the lifetime of the screen; display
+        # index i (newest first) is operations index _last_ops_index - i
+        self._last_ops_index = len(file.operations) - 1
         self._view_mode: str = "diff"
         self._VIEW_MODES = ("diff", "full-diff", "content")
         self._current_display_index: int = 0
+        self._preview_timer: Timer | None = None
+        # File content after each operation, filled oldest-first by a
+        # background worker; indices past its end are replayed on demand
+        self._snapshots: list[str | None] = []
+        # Resume point for those on-demand replays, so stepping forward past
+        # the snapshots only replays the new operations
+        self._replay_state = ReplayState()
+        # Most recently shown hint and preview visuals, up to _VIEW_CACHE_SIZE; the
+        # operations are fixed for the lifetime of the screen, so entries never
+        # need invalidating
+        self._view_cache: OrderedDict[tuple[int, str], tuple[Visual, Visual]] = (
+            OrderedDict()
+        )
+        self._hint_visuals: dict[str, Visual] = {}
+        # (operations index, view mode) currently shown in the preview
+        self._last_rendered_key: tuple[int, str] | None = None
 
     _MODE_LABELS = {
         "content": "Recovered File",
         "diff": "Diff",
         "full-diff": "Full Diff",
     }
+    # Hint per (view mode, op type, partial read); content mode uses the default
+    _VIEW_HINT_TEMPLATES = {
+        ("diff", OpType.READ, True): (
+            " {label}: Showing only the lines that were read, with line numbers"
+        ),
+        ("diff", OpType.READ, False): " {label}: Full file read",
+        ("diff", OpType.EDIT, False): (
+            " {label}: Showing unified diff of the changes made by this edit"
+        ),
+        ("diff", OpType.WRITE_CREATE, False): (
+            " {label}: Showing unified diff vs previous state"
+        ),
+        ("diff", OpType.WRITE_UPDATE, False): (
+            " {label}: Showing unified diff vs previous state"
+        ),
+        ("diff", OpType.FILE_HISTORY, False): (
+            " {label}: Showing unified diff of changes"
+        ),
+        ("full-diff", OpType.READ, True): (
+            " {label}: Full file with read range marked (┃ = read, │ = outside)"
+        ),
+        ("full-diff", OpType.READ, False): " {label}: Full file read",
+        ("full-diff", OpType.EDIT, False): (
+            " {label}: Full file with inline diff of the edit changes"
+        ),
+        ("full-diff", OpType.WRITE_CREATE, False): (
+            " {label}: Full file with inline diff vs previous state"
+        ),
+        ("full-diff", OpType.WRITE_UPDATE, False): (
+            " {label}: Full file with inline diff vs previous state"
+        ),
+        ("full-diff", OpType.FILE_HISTORY, False): (
+            " {label}: Full file with inline diff of changes"
+        ),
+    }
     _TAB_ID_TO_MODE = {
         "tab_diff": "diff",
         "tab_full_diff": "full-diff",
@@ -70,14 +173,6 @@ class FileDetailScreen(Screen):
             tabs.append(tab)
         return tabs
 
-    def _update_tabs(self) -> None:
-        for mode in self._VIEW_MODES:
-            tab = self.query_one(f"#tab_{mode.replace('-', '_')}", Static)
-            if mode == self._view_mode:
-                tab.set_classes("view-tab view-tab--active")
-            else:
-                tab.set_classes("view-tab")
-
     def compose(self) -> ComposeResult:
         with Horizontal(id="detail_header"):
             for tab in self._render_tabs():
@@ -96,65 +191,122 @@ class FileDetailScreen(Screen):
             with VerticalScroll(id="preview_pane"):
                 yield Static("Select a snapshot to preview", id="file_content")
         yield Static("", id="view_hint")
-        yield Static("", id="output_dir")
+        yield Static(f" Output directory: {self.app.output_dir}", id="output_dir")
         yield Footer()
 
     def on_mount(self) -> None:
-        self.query_one("#output_dir", Static).update(
-            f" Output directory: {self.app.output_dir}"
+        # Widgets touched on every keypress, looked up once
+        self._preview = self.query_one("#file_content", Static)
+        self._view_hint_widget = self.query_one("#view_hint", Static)
+        self._output_dir_widget = self.query_one("#output_dir", Static)
+        self._snapshot_list = snapshot_list = self.query_one(
+            "#snapshot_list", OptionList
         )
-        snapshot_list = self.query_one("#snapshot_list", OptionList)
-        for op in self._display_ops:
-            ts = utc_to_local(op.timestamp) if op.timestamp else "unknown"
-            op_label = op.type.value.replace("_", " ").title()
-            label = f"{ts}  {op_label}  ✗" if op.is_error else f"{ts}  {op_label}"
-            snapshot_list.add_option(Option(label))
-        if self._display_ops:
+        self._tabs = {
+            mode: self.query_one(f"#tab_{mode.replace('-', '_')}", Static)
+            for mode in self._VIEW_MODES
+        }
+        # Add all rows in one call so the list lays itself out once
+        snapshot_list.add_options(
+            [
+                Option(_snapshot_label(op.timestamp, op.type, op.is_error))
+                # Newest first, matching the display index order
+                for op in reversed(self.file.operations)
+            ]
+        )
+        self._precompute_snapshots()
+        if self.file.operations:
             snapshot_list.highlighted = 0
             self._update_preview(0)
 
     def on_option_list_option_highlighted(
         self, event: OptionList.OptionHighlighted
     ) -> None:
-        """Update file preview when a different snapshot is highlighted."""
-        if event.option_index is not None:
-            self._update_preview(event.option_index)
+        """Update file preview when a different snapshot is highlighted.
+
+        Rendering is debounced so holding j/k only renders where the cursor
+        comes to rest, not every row it passes over.
+        """
+        if event.option_index is None:
+            return
+        if self._preview_timer is not None:
+            self._preview_timer.stop()
+            self._preview_timer = None
+        if event.option_index == self._current_display_index:
+            return
+        self._preview_timer = self.set_timer(
+            _PREVIEW_DEBOUNCE_SECONDS,
+            partial(self._update_preview, event.option_index),
+        )
 
-    def _get_view_hint(
-        self, op: "FileOperation", is_read_op: bool, is_partial_read: bool
-    ) -> str:
+    def _get_view_hint(self, op: FileOperation, is_partial_read: bool) -> str:
         """Return a one-line description of what the current view is showing."""
-        op_label = op.type.value.replace("_", " ").title()
-        if self._view_mode == "diff":
-            if is_partial_read:
-                return f" {op_label}: Showing only the lines that were read, with line numbers"
-            elif is_read_op:
-                return f" {op_label}: Full file read"
-            elif op.type == OpType.EDIT:
-                return f" {op_label}: Showing unified diff of the changes made by this edit"
-            elif op.type in (OpType.WRITE_CREATE, OpType.WRITE_UPDATE):
-                return f" {op_label}: Showing unified diff vs previous state"
-            return f" {op_label}: Showing unified diff of changes"
-        elif self._view_mode == "full-diff":
-            if is_partial_read:
-                return f" {op_label}: Full file with read range marked (┃ = read, │ = outside)"
-            elif is_read_op:
-                return f" {op_label}: Full file read"
-            elif op.type == OpType.EDIT:
-                return f" {op_label}: Full file with inline diff of the edit changes"
-            elif op.type in (OpType.WRITE_CREATE, OpType.WRITE_UPDATE):
-                return f" {op_label}: Full file with inline diff vs previous state"
-            return f" {op_label}: Full file with inline diff of changes"
-        else:
-            return f" {op_label}: Full reconstructed file at this snapshot"
+        template = self._VIEW_HINT_TEMPLATES.get(
+            (self._view_mode, op.type, is_partial_read),
+            " {label}: Full reconstructed file at this snapshot",
+        )
+        return template.format(label=_OP_DISPLAY_LABELS[op.type])
+
+    @work(thread=True, exclusive=True)
+    def _precompute_snapshots(self) -> None:
+        """Replay the timeline once, recording the content after every operation."""
+        worker = get_current_worker()
+        snapshots = self._snapshots
+        total = 0
+        for content in iter_file_states(self.file.operations):
+            if worker.is_cancelled:
+                return
+            total += len(content) if content else 0
+            if total > _SNAPSHOT_BUDGET_CHARS:
+                return
+            snapshots.append(content)
+
+    def _content_at(self, ops_index: int) -> str | None:
+        """Return the reconstructed file content at ops_index."""
+        if ops_index < len(self._snapshots):
+            return self._snapshots[ops_index]
+        return reconstruct_file_at(self.file.operations, ops_index, self._replay_state)
 
     def _update_preview(self, display_index: int) -> None:
         """Reconstruct file at the selected snapshot and show in preview."""
+        self._preview_timer = None
         self._current_display_index = display_index
         # Convert display index (newest-first) to operations index (oldest-first)
-        ops_index = len(self.file.operations) - 1 - display_index
+        ops_index = self._last_ops_index - display_index
+        key = (ops_index, self._view_mode)
+        if key == self._last_rendered_key:
+            return
+        self._last_rendered_key = key
+        view_cache = self._view_cache
+        rendered = view_cache.get(key)
+        if rendered is not None:
+            view_cache.move_to_end(key)
+        else:
+            hint, content = self._render_preview(ops_index)
+            # Cache the converted visuals, not the Text/markup they came from,
+            # so revisits skip markup parsing and Text-to-Content conversion.
+            # Hints repeat across snapshots, so equal hints share one visual.
+            hint_visual = self._hint_visuals.get(hint)
+            if hint_visual is None:
+                hint_visual = self._hint_visuals[hint] = visualize(
+                    self._view_hint_widget, hint
+                )
+            rendered = view_cache[key] = (
+                hint_visual,
+                visualize(self._preview, content),
+            )
+            if len(view_cache) > _VIEW_CACHE_SIZE:
+                view_cache.popitem(last=False)
+        hint, content = rendered
+        # Skip widgets whose visual is already the one on screen
+        if hint is not self._view_hint_widget.visual:
+            self._view_hint_widget.update(hint)
+        if content is not self._preview.visual:
+            self._preview.update(content)
+
+    def _render_preview(self, ops_index: int) -> tuple[str, object]:
+        """Build the view hint and preview content for one snapshot."""
         op = self.file.operations[ops_index]
-        preview = self.query_one("#file_content", Static)
 
         # Build provenance header for merged files
         # Character-level wrapping is handled by CSS: text-wrap: nowrap + text-overflow: fold
@@ -170,69 +322,49 @@ class FileDetailScreen(Screen):
             op.read_offset is not None or op.read_limit is not None
         )
 
-        self.query_one("#view_hint", Static).update(
-            self._get_view_hint(op, is_read_op, is_partial_read)
-        )
-
-        def _with_provenance(content):
-            """Prepend provenance header, handling both str and Rich Text."""
-            if not provenance:
-                return content
-            from rich.text import Text as RichText
-
-            if isinstance(content, RichText):
-                result = RichText(provenance)
-                result.append(content)
-                return result
-            return provenance + content
+        hint = self._get_view_hint(op, is_partial_read)
 
         if op.is_error:
-            op_label = op.type.value.replace("_", " ").title()
-            self.query_one("#view_hint", Static).update(
-                f" {op_label}: Tool call failed"
-            )
-            preview.update(
-                _with_provenance(f"[Error] {op.error_message or 'Tool call failed'}")
+            return (
+                f" {_OP_DISPLAY_LABELS[op.type]}: Tool call failed",
+                f"{provenance}[Error] {op.error_message or 'Tool call failed'}",
             )
-            return
 
         if self._view_mode in ("diff", "full-diff"):
             if is_read_op:
-                content = reconstruct_file_at(self.file.operations, ops_index)
-                if content is not None:
-                    text = format_read_range_view(
-                        content,
-                        op.read_offset,
-                        op.read_limit,
-                        full=(self._view_mode == "full-diff"),
-                    )
-                    preview.update(_with_provenance(text))
-                else:
-                    preview.update("[No content available at this snapshot]")
-            else:
-                before, after = compute_before_after(self.file.operations, ops_index)
-                if before is None or after is None:
-                    preview.update("[No diff available for this snapshot]")
-                elif self._view_mode == "full-diff":
-                    text = format_full_diff_text(before, after, self.file.path)
-                    preview.update(_with_provenance(text))
-                else:
-                    text = format_diff_text(before, after, self.file.path)
-                    preview.update(_with_provenance(text))
-        else:
-            content = reconstruct_file_at(self.file.operations, ops_index)
-            if content is not None:
-                lines = content.split("\n")
-                if len(lines) > 500:
-                    display = (
-                        "\n".join(lines[:500])
-                        + f"\n\n... ({len(lines) - 500} more lines)"
-                    )
-                else:
-                    display = content
-                preview.update(_with_provenance(display))
+                content = self._content_at(ops_index)
+                if content is None:
+                    return hint, "[No content available at this snapshot]"
+                text = format_read_range_view(
+                    content,
+                    op.read_offset,
+                    op.read_limit,
+                    full=(self._view_mode == "full-diff"),
+                    prefix=provenance,
+                )
+                return hint, text
+            before, after = compute_before_after(
+                self.file.operations, ops_index, self._content_at
+            )
+            if before is None or after is None:
+                return hint, "[No diff available for this snapshot]"
+            elif self._view_mode == "full-diff":
+                text = format_full_diff_text(
+                    before, after, self.file.path, prefix=provenance
+                )
             else:
-                preview.update("[No content available at this snapshot]")
+                text = format_diff_text(
+                    before, after, self.file.path, prefix=provenance
+                )
+            return hint, text
+
+        content = self._content_at(ops_index)
+        if content is None:
+            return hint, "[No content available at this snapshot]"
+        display, more = _head_lines(content, 500)
+        if more:
+            display += f"\n\n... ({more} more lines)"
+        return hint, provenance + display
 
     def action_go_back(self) -> None:
         self.app.pop_screen()
@@ -241,8 +373,10 @@ class FileDetailScreen(Screen):
         """Switch to the given view mode and refresh."""
         if mode == self._view_mode:
             return
+        # Only the previously active tab and the new one change state
+        self._tabs[self._view_mode].remove_class("view-tab--active")
+        self._tabs[mode].add_class("view-tab--active")
         self._view_mode = mode
-        self._update_tabs()
         self._update_preview(self._current_display_index)
 
     def on_click(self, event) -> None:
@@ -258,28 +392,30 @@ class FileDetailScreen(Screen):
 
     def action_extract_snapshot(self) -> None:
         """Extract file at the currently highlighted snapshot."""
-        snapshot_list = self.query_one("#snapshot_list", OptionList)
-        idx = snapshot_list.highlighted
+        idx = self._snapshot_list.highlighted
         if idx is None:
             return
-        ops_index = len(self.file.operations) - 1 - idx
-        content = reconstruct_file_at(self.file.operations, ops_index)
+        ops_index = self._last_ops_index - idx
+        content = self._content_at(ops_index)
         if content is None:
             self.notify("No content at this snapshot", severity="warning")
             return
 
-        app = self.app
         rel = self.file.path.lstrip("/")
-        out = app.output_dir / rel
+        self._write_snapshot(self.app.output_dir / rel, content)
+
+    @work(thread=True)
+    def _write_snapshot(self, out: Path, content: str) -> None:
+        """Write extracted content off the UI thread, then report where it went."""
         out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(content, encoding="utf-8")
+        out.write_bytes(content.encode("utf-8"))
         self.notify(f"Extracted to {out}")
 
     def action_cursor_down(self) -> None:
-        self.query_one("#snapshot_list", OptionList).action_cursor_down()
+        self._snapshot_list.action_cursor_down()
 
     def action_cursor_up(self) -> None:
-        self.query_one("#snapshot_list", OptionList).action_cursor_up()
+        self._snapshot_list.action_cursor_up()
 
     def action_change_output(self) -> None:
         """Open modal to change the output directory."""
@@ -294,9 +430,7 @@ class FileDetailScreen(Screen):
         """Apply the new output directory from the modal."""
         if result is not None:
             self.app.output_dir = result
-            self.query_one("#output_dir", Static).update(
-                f" Output directory: {self.app.output_dir}"
-            )
+            self._output_dir_widget.update(f" Output directory: {self.app.output_dir}")
 
     def action_show_help(self) -> None:
         self.notify(
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import re
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter, itemgetter
 from pathlib import Path
+from threading import Lock
 
+from textual import work
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal
@@ -11,16 +18,51 @@ from textual.screen import Screen
 from textual.timer import Timer
 from textual.widgets import Footer, Input, Label, SelectionList, Static
 from textual.widgets.selection_list import Selection
+from textual.worker import get_current_worker
 
 from claude_file_recovery.core.filters import (
     SearchMode,
+    compile_glob,
+    compile_regex,
     match_path,
-    validate_regex,
     smart_case_sensitive,
 )
 from claude_file_recovery.core.timestamps import utc_to_local
 from claude_file_recovery.core.models import RecoverableFile
 from claude_file_recovery.core.reconstructor import reconstruct_latest
+from claude_file_recovery.tui.file_detail_screen import FileDetailScreen
+
+
+@lru_cache(maxsize=1 << 16)
+def _day_label(timestamp: str) -> str:
+    """Local calendar day of *timestamp* for the file list, memoized."""
+    return utc_to_local(timestamp, "%Y-%m-%d") if timestamp else "unknown"
+
+
+# Threads writing extracted files concurrently
+_EXTRACT_WORKERS = 8
+
+# Stop remembering extracted content once it holds this many characters in
+# total; later files are reconstructed on every extract instead
+_LATEST_CACHE_BUDGET_CHARS = 64 * 1024 * 1024
+
+
+@lru_cache(maxsize=1 << 16)
+def _output_path(output_dir: Path, path: str) -> Path:
+    """Where *path* is extracted to under *output_dir*, memoized."""
+    return output_dir / path.lstrip("/")
+
+
+def _char_mask(text: str) -> int:
+    """Bitmask of the characters in *text*, each folded onto one of 64 bits.
+
+    If every bit of one string's mask is set in another's, the second may
+    contain all of the first's characters; if not, it certainly doesn't.
+    """
+    mask = 0
+    for c in set(text):
+        mask |= 1 << (ord(c) & 63)
+    return mask
 
 
 class FileSelectionList(SelectionList):
@@ -79,8 +121,30 @@ class FileListScreen(Screen):
         self._selection_mode = False
         self._search_query = ""
         self._all_files: list[RecoverableFile] = []
+        # Per-entry data for _all_files, computed once per load: the path,
+        # path.lower() and the list option (reused by every refilter)
+        self._paths: list[str] = []
+        self._paths_lower: list[str] = []
+        self._selections: list[Selection[str]] = []
+        # _char_mask() of each entry of _paths_lower
+        self._char_masks: list[int] = []
+        # (file index, by_timestamp) that _all_files was loaded from
+        self._loaded_from: tuple[dict[str, RecoverableFile], bool] | None = None
         self._filtered_paths: list[str] = []
+        # Query that produced _filtered_paths
+        self._last_query = ""
         self._debounce_timer: Timer | None = None
+        # Latest reconstructed content by path, with the file it came from so
+        # a swapped index is not served stale content
+        self._latest_cache: dict[str, tuple[RecoverableFile, str | None]] = {}
+        self._latest_cache_chars = 0
+        # Guards the two above: a cancelled extract may still be finishing
+        # while its replacement starts
+        self._latest_cache_lock = Lock()
+        # Fuzzy results as (query, matching _all_files indices in order, the
+        # same indices best first), one frame per query the current one
+        # extends; cleared with _all_files
+        self._filter_stack: list[tuple[str, list[int], list[int]]] = []
 
     def compose(self) -> ComposeResult:
         with Horizontal(id="search_bar"):
@@ -105,21 +169,54 @@ class FileListScreen(Screen):
         yield Footer()
 
     def on_mount(self) -> None:
-        app = self.app  # type: FileRecoveryApp
-        self._all_files = sorted(
-            app.file_index.values(),
-            key=lambda f: f.path,
-        )
+        # Widgets touched on every keypress, looked up once
+        self._file_list = self.query_one("#file_list", FileSelectionList)
+        self._filter_input = self.query_one("#filter", Input)
+        self._mode_label = self.query_one("#mode_label", Label)
+        self._status_widget = self.query_one("#status", Static)
+        self._output_dir_widget = self.query_one("#output_dir", Static)
+        self._symlink_text_widget = self.query_one("#symlink_text", Static)
+        self._symlink_action_widget = self.query_one("#symlink_action", Static)
+        self._load_files()
         self._repopulate_list()
-        self.query_one("#filter", Input).focus()
+        self._filter_input.focus()
+
+    def _load_files(self, *, by_timestamp: bool = False) -> None:
+        """Load app.file_index, sorted, and rebuild the per-file list data.
+
+        Files are sorted by path, or newest first with *by_timestamp*.
+        Reloading the index that is already loaded in the same order is a
+        no-op, so returning from another screen keeps the cached data.
+        """
+        index = self.app.file_index
+        loaded = self._loaded_from
+        if loaded is not None and loaded[0] is index and loaded[1] == by_timestamp:
+            return
+        if by_timestamp:
+            files = sorted(
+                index.values(), key=attrgetter("latest_timestamp"), reverse=True
+            )
+        else:
+            files = sorted(index.values(), key=attrgetter("path"))
+        self._loaded_from = (index, by_timestamp)
+        self._all_files = files
+        self._paths = [rf.path for rf in files]
+        self._paths_lower = [path.lower() for path in self._paths]
+        self._char_masks = [_char_mask(path) for path in self._paths_lower]
+        self._selections = [
+            Selection(
+                f"{_day_label(rf.latest_timestamp)}  {rf.path}"
+                f"  ({rf.operation_count} ops)",
+                rf.path,
+            )
+            for rf in files
+        ]
+        self._filter_stack.clear()
 
     def _repopulate_list(self) -> None:
         """Repopulate the selection list based on current search query."""
-        file_list = self.query_one("#file_list", SelectionList)
-        file_list.clear_options()
-
         app = self.app  # type: FileRecoveryApp
-        self._filtered_paths = []
+        all_indices = range(len(self._all_files))
 
         if self._search_query:
             case_sensitive = smart_case_sensitive(self._search_query)
@@ -127,53 +224,129 @@ class FileListScreen(Screen):
 
             # Handle invalid regex gracefully
             if mode is SearchMode.REGEX:
-                error = validate_regex(self._search_query)
-                mode_label = self.query_one("#mode_label", Label)
-                if error:
-                    mode_label.add_class("error")
-                    items = self._all_files  # show all files on invalid regex
+                try:
+                    # Compiled once per query (and memoized across keystrokes)
+                    # instead of once per file inside match_path
+                    regex = compile_regex(
+                        self._search_query, 0 if case_sensitive else re.IGNORECASE
+                    )
+                except re.error:
+                    self._mode_label.add_class("error")
+                    indices = all_indices  # show all files on invalid regex
                 else:
-                    mode_label.remove_class("error")
-                    items = [
-                        rf
-                        for rf in self._all_files
-                        if match_path(rf.path, self._search_query, mode, case_sensitive)
-                        > 0
-                    ]
+                    self._mode_label.remove_class("error")
+                    search = regex.search
+                    indices = [i for i, path in enumerate(self._paths) if search(path)]
             elif mode is SearchMode.FUZZY:
-                scored = []
-                for rf in self._all_files:
-                    score = match_path(
-                        rf.path, self._search_query, mode, case_sensitive
-                    )
-                    if score > 0:
-                        scored.append((score, rf))
-                scored.sort(key=lambda x: x[0], reverse=True)
-                items = [rf for _, rf in scored]
+                candidates = self._fuzzy_candidates(self._search_query)
+                stack = self._filter_stack
+                if stack and stack[-1][0] == self._search_query:
+                    # Same query as the deepest frame (e.g. after a backspace
+                    # or a mode round-trip): reuse its ranking
+                    indices = stack[-1][2]
+                else:
+                    indices = self._rank_fuzzy(candidates)
             else:
-                # GLOB mode — binary match, keep original order
-                items = [
-                    rf
-                    for rf in self._all_files
-                    if match_path(rf.path, self._search_query, mode, case_sensitive) > 0
-                ]
+                # GLOB mode — binary match, keep original order. The glob is
+                # translated to a regex once per query; the full path or its
+                # basename must match, as in match_path.
+                if case_sensitive:
+                    query, paths = self._search_query, self._paths
+                else:
+                    query, paths = self._search_query.lower(), self._paths_lower
+                if not any(c in query for c in "*?["):
+                    # No wildcards: the glob only matches a path or basename
+                    # equal to it, so compare strings instead of matching
+                    suffix = None if "/" in query else "/" + query
+                    indices = [
+                        i
+                        for i, path in enumerate(paths)
+                        if path == query or (suffix and path.endswith(suffix))
+                    ]
+                else:
+                    match = compile_glob(query).match
+                    indices = [
+                        i
+                        for i, path in enumerate(paths)
+                        if match(path) or match(path.rsplit("/", 1)[-1])
+                    ]
         else:
             # Clear any error state when query is empty
-            self.query_one("#mode_label", Label).remove_class("error")
-            items = self._all_files
-
-        for rf in items:
-            ts = (
-                utc_to_local(rf.latest_timestamp, "%Y-%m-%d")
-                if rf.latest_timestamp
-                else "unknown"
-            )
-            label = f"{ts}  {rf.path}  ({rf.operation_count} ops)"
-            is_selected = rf.path in app.selected_paths
-            file_list.add_option(Selection(label, rf.path, is_selected))
-            self._filtered_paths.append(rf.path)
+            self._mode_label.remove_class("error")
+            indices = all_indices
 
-        self._update_status()
+        if indices is all_indices:
+            # Unfiltered: the per-load lists are already in display order
+            options, filtered = self._selections, self._paths
+        else:
+            selections, paths = self._selections, self._paths
+            options = [selections[i] for i in indices]
+            filtered = [paths[i] for i in indices]
+        file_list = self._file_list
+        selected = app.selected_paths
+        # One repaint for the cleared list, the new rows and the status line
+        with app.batch_update():
+            # Restoring selected rows would post one SelectedChanged each;
+            # app.selected_paths already holds them
+            with file_list.prevent(SelectionList.SelectedChanged):
+                file_list.clear_options()
+                file_list.add_options(options)
+                for path in filtered:
+                    if path in selected:
+                        file_list.select(path)
+            self._filtered_paths = filtered
+            self._last_query = self._search_query
+
+            self._update_status()
+
+    def _rank_fuzzy(self, candidates: Sequence[int]) -> list[int]:
+        """Score *candidates* against the fuzzy query, best first.
+
+        Pushes a frame with the survivors and their ranking so that later
+        queries extending this one start from the survivors.
+        """
+        query = self._search_query
+        paths, paths_lower = self._paths, self._paths_lower
+        char_masks = self._char_masks
+        query_lower = query.lower()
+        query_mask = _char_mask(query_lower)
+        query_len = len(query_lower)
+        scored = []
+        survivors = []
+        for i in candidates:
+            # A match needs every query character, in order, so a shorter
+            # path or a missing character rules it out
+            if (
+                char_masks[i] & query_mask != query_mask
+                or len(paths_lower[i]) < query_len
+            ):
+                continue
+            score = match_path(
+                paths[i],
+                query,
+                SearchMode.FUZZY,
+                False,  # fuzzy scoring always ignores case
+                path_lower=paths_lower[i],
+            )
+            if score > 0:
+                scored.append((score, i))
+                survivors.append(i)
+        scored.sort(key=itemgetter(0), reverse=True)
+        ranked = [i for _, i in scored]
+        self._filter_stack.append((query, survivors, ranked))
+        return ranked
+
+    def _fuzzy_candidates(self, query: str) -> Sequence[int]:
+        """Return indices of the files that can still match *query* in fuzzy mode.
+
+        A fuzzy query only matches paths it is a subsequence of, so extending
+        a query can only drop files. Frames for queries that *query* does not
+        extend are discarded; the deepest remaining frame bounds the search.
+        """
+        stack = self._filter_stack
+        while stack and not query.startswith(stack[-1][0]):
+            stack.pop()
+        return stack[-1][1] if stack else range(len(self._all_files))
 
     def _update_status(self) -> None:
         app = self.app  # type: FileRecoveryApp
@@ -188,49 +361,51 @@ class FileListScreen(Screen):
         else:
             symlink_text = "symlink detection: disabled "
             action_text = " to enable"
-        self.query_one("#output_dir", Static).update(
-            f" Output directory: {app.output_dir}"
-        )
-        self.query_one("#status", Static).update(
+        self._output_dir_widget.update(f" Output directory: {app.output_dir}")
+        self._status_widget.update(
             f" {selected} selected | {filtered} shown | {total} total{mode}"
         )
-        self.query_one("#symlink_text", Static).update(f" | {symlink_text}")
-        self.query_one("#symlink_action", Static).update(action_text)
+        self._symlink_text_widget.update(f" | {symlink_text}")
+        self._symlink_action_widget.update(action_text)
 
     def on_selection_list_selected_changed(self, event) -> None:
         """Track selection state in app.selected_paths."""
-        app = self.app
-        file_list = self.query_one("#file_list", SelectionList)
-        app.selected_paths = set(file_list.selected)
+        self.app.selected_paths = set(self._file_list.selected)
         self._update_status()
 
     def on_input_changed(self, event: Input.Changed) -> None:
         """React to search input changes — debounce then filter."""
         self._search_query = event.value
-        self.query_one("#file_list").add_class("stale")
+        self._file_list.add_class("stale")
         if self._debounce_timer:
             self._debounce_timer.stop()
         self._debounce_timer = self.set_timer(self.DEBOUNCE_DELAY, self._apply_filter)
 
     def _apply_filter(self) -> None:
         """Called after debounce delay — run the actual filter."""
-        self._repopulate_list()
-        self.query_one("#file_list").remove_class("stale")
+        # An extended fuzzy query can only lose matches, so once the list is
+        # empty it stays empty until the query is edited back
+        if not (
+            self.search_mode is SearchMode.FUZZY
+            and not self._filtered_paths
+            and self._search_query.startswith(self._last_query)
+        ):
+            self._repopulate_list()
+        self._file_list.remove_class("stale")
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         """Switch focus to file list when Enter is pressed in search input."""
-        self.query_one("#file_list", SelectionList).focus()
+        self._file_list.focus()
 
     def on_key(self, event) -> None:
         """Handle Escape key to return focus from search input to file list."""
         if event.key == "escape":
-            filter_input = self.query_one("#filter", Input)
-            if filter_input.has_focus:
-                self.query_one("#file_list", SelectionList).focus()
+            if self._filter_input.has_focus:
+                self._file_list.focus()
                 event.stop()
 
     def action_search(self) -> None:
-        self.query_one("#filter", Input).focus()
+        self._filter_input.focus()
 
     _MODE_ORDER = [SearchMode.FUZZY, SearchMode.GLOB, SearchMode.REGEX]
 
@@ -241,13 +416,13 @@ class FileListScreen(Screen):
 
     def watch_search_mode(self, mode: SearchMode) -> None:
         """React to search mode changes — update label and re-filter."""
-        mode_label = self.query_one("#mode_label", Label)
+        mode_label = self._mode_label
         mode_label.update(f"\\[{mode.value.upper()}]")
         mode_label.remove_class("error")
         self._repopulate_list()
 
     def action_toggle_select(self) -> None:
-        file_list = self.query_one("#file_list", SelectionList)
+        file_list = self._file_list
         idx = file_list.highlighted
         if idx is not None:
             file_list.toggle(file_list.get_option_at_index(idx))
@@ -258,14 +433,12 @@ class FileListScreen(Screen):
         self._update_status()
 
     def action_select_all_filtered(self) -> None:
-        file_list = self.query_one("#file_list", SelectionList)
-        for i in range(file_list.option_count):
-            file_list.select(file_list.get_option_at_index(i))
+        # The list holds exactly the filtered files; select_all posts a single
+        # SelectedChanged instead of one per option
+        self._file_list.select_all()
 
     def action_deselect_all_filtered(self) -> None:
-        file_list = self.query_one("#file_list", SelectionList)
-        for i in range(file_list.option_count):
-            file_list.deselect(file_list.get_option_at_index(i))
+        self._file_list.deselect_all()
 
     def action_extract(self) -> None:
         app = self.app
@@ -280,30 +453,97 @@ class FileListScreen(Screen):
                 severity="warning",
                 timeout=6,
             )
+        self._extract_files(list(app.selected_paths), app.file_index, app.output_dir)
+
+    @work(thread=True, exclusive=True)
+    def _extract_files(
+        self,
+        paths: list[str],
+        file_index: dict[str, RecoverableFile],
+        output_dir: Path,
+    ) -> None:
+        """Reconstruct and write *paths* off the UI thread, then report.
+
+        Reconstruction and directory creation run here, one file at a time;
+        only the writes go to the pool. A file that cannot be written is
+        reported rather than aborting the rest.
+        """
+        worker = get_current_worker()
+        failures: list[tuple[str, OSError]] = []
+        created: set[Path] = set()
+        pending = []
+
+        def write_one(out: Path, data: bytes) -> OSError | None:
+            try:
+                out.write_bytes(data)
+            except OSError as e:
+                return e
+            return None
+
+        # Writes release the GIL, so a few threads overlap their I/O
+        with ThreadPoolExecutor(max_workers=_EXTRACT_WORKERS) as pool:
+            for path in paths:
+                if worker.is_cancelled:
+                    return
+                rf = file_index.get(path)
+                if not rf:
+                    continue
+                content = self._latest_content(rf)
+                if content is None:
+                    continue
+                out = _output_path(output_dir, path)
+                if out.parent not in created:
+                    try:
+                        out.parent.mkdir(parents=True, exist_ok=True)
+                    except OSError as e:
+                        failures.append((path, e))
+                        continue
+                    created.add(out.parent)
+                data = content.encode("utf-8")
+                pending.append((path, pool.submit(write_one, out, data)))
+
         success = 0
-        for path in app.selected_paths:
-            rf = app.file_index.get(path)
-            if not rf:
-                continue
-            content = reconstruct_latest(rf)
-            if content is None:
-                continue
-            rel = path.lstrip("/")
-            out = app.output_dir / rel
-            out.parent.mkdir(parents=True, exist_ok=True)
-            out.write_text(content, encoding="utf-8")
-            success += 1
-        self.notify(f"Extracted {success} files to {app.output_dir}")
+        for path, future in pending:
+            error = future.result()
+            if error is None:
+                success += 1
+            else:
+                failures.append((path, error))
+        self.notify(f"Extracted {success} files to {output_dir}")
+        if failures:
+            path, error = failures[0]
+            self.notify(
+                f"Failed to write {len(failures)} files (first: {path}: {error})",
+                severity="error",
+                timeout=8,
+            )
+
+    def _latest_content(self, rf: RecoverableFile) -> str | None:
+        """reconstruct_latest(rf), remembered per file up to a size budget."""
+        with self._latest_cache_lock:
+            cached = self._latest_cache.get(rf.path)
+        if cached is not None and cached[0] is rf:
+            return cached[1]
+        content = reconstruct_latest(rf)
+        size = len(content) if content else 0
+        with self._latest_cache_lock:
+            if self._latest_cache_chars + size <= _LATEST_CACHE_BUDGET_CHARS:
+                previous = self._latest_cache.get(rf.path)
+                if previous is not None and previous[1]:
+                    self._latest_cache_chars -= len(previous[1])
+                self._latest_cache[rf.path] = (rf, content)
+                self._latest_cache_chars += size
+        return content
 
     def on_file_selection_list_double_clicked(self) -> None:
         self.action_open_detail()
 
     def action_open_detail(self) -> None:
         """Open the detail view for the highlighted file, or switch focus from search."""
-        if self.query_one("#filter", Input).has_focus:
-            self.query_one("#file_list", SelectionList).focus()
+        if self._filter_input.has_focus:
+            self._file_list.focus()
             return
-        file_list = self.query_one("#file_list", SelectionList)
+        file_list = self._file_list
         idx = file_list.highlighted
         if idx is None:
             return
@@ -311,8 +551,6 @@ class FileListScreen(Screen):
         path = self._filtered_paths[idx]
         rf = self.app.file_index.get(path)
         if rf:
-            from claude_file_recovery.tui.file_detail_screen import FileDetailScreen
-
             self.app.push_screen(FileDetailScreen(rf))
 
     def action_toggle_symlinks(self) -> None:
@@ -324,11 +562,7 @@ class FileListScreen(Screen):
             app.symlinks_enabled = False
             app.file_index = app.raw_file_index
             self.notify("Symlink deduplication disabled")
-            self._all_files = sorted(
-                app.file_index.values(),
-                key=lambda f: f.latest_timestamp,
-                reverse=True,
-            )
+            self._load_files(by_timestamp=True)
             self._repopulate_list()
             return
 
@@ -337,11 +571,7 @@ class FileListScreen(Screen):
             app.symlinks_enabled = True
             app.file_index = app.merged_file_index
             self.notify("Symlink deduplication enabled")
-            self._all_files = sorted(
-                app.file_index.values(),
-                key=lambda f: f.latest_timestamp,
-                reverse=True,
-            )
+            self._load_files(by_timestamp=True)
             self._repopulate_list()
             return
 
@@ -363,11 +593,7 @@ class FileListScreen(Screen):
 
     def on_screen_resume(self) -> None:
         """Refresh file list when returning from another screen (e.g., after re-merge)."""
-        app = self.app  # type: FileRecoveryApp
-        self._all_files = sorted(
-            app.file_index.values(),
-            key=lambda f: f.path,
-        )
+        self._load_files()
         self._repopulate_list()
 
     def action_change_output(self) -> None:
@@ -395,7 +621,7 @@ class FileListScreen(Screen):
         )
 
     def action_cursor_down(self) -> None:
-        file_list = self.query_one("#file_list", SelectionList)
+        file_list = self._file_list
         file_list.action_cursor_down()
         if self._selection_mode:
             idx = file_list.highlighted
@@ -403,7 +629,7 @@ class FileListScreen(Screen):
                 file_list.toggle(file_list.get_option_at_index(idx))
 
     def action_cursor_up(self) -> None:
-        file_list = self.query_one("#file_list", SelectionList)
+        file_list = self._file_list
         file_list.action_cursor_up()
         if self._selection_mode:
             idx = file_list.highlighted
@@ -411,13 +637,13 @@ class FileListScreen(Screen):
                 file_list.toggle(file_list.get_option_at_index(idx))
 
     def action_go_top(self) -> None:
-        file_list = self.query_one("#file_list", SelectionList)
+        file_list = self._file_list
         if file_list.option_count > 0:
             file_list.highlighted = 0
             file_list.scroll_home()
 
     def action_go_bottom(self) -> None:
-        file_list = self.query_one("#file_list", SelectionList)
+        file_list = self._file_list
         last = file_list.option_count - 1
         if last >= 0:
             file_list.highlighted = last
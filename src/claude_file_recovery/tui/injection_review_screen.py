@@ -2,9 +2,16 @@ from __future__ import annotations
 
 from textual.app import ComposeResult
 from textual.binding import Binding
+from textual.content import Content
 from textual.screen import Screen
 from textual.widgets import Footer, Static
 
+from claude_file_recovery.core.injection import strip_injected_content
+
+
+# Separator drawn above and below each pattern's content
+_RULE = " " + "─" * 60
+
 
 class InjectionReviewScreen(Screen):
     """Review detected injected content before stripping from recovered files."""
@@ -53,17 +60,20 @@ class InjectionReviewScreen(Screen):
             lines.append(
                 f" {p.affected_op_count} ops in {p.affected_file_count} files:"
             )
-            lines.append(" " + "─" * 60)
-            for content_line in p.content.splitlines():
-                lines.append(f" {content_line}")
-            lines.append(" " + "─" * 60)
+            lines.append(_RULE)
+            lines.extend(f" {content_line}" for content_line in p.content.splitlines())
+            lines.append(_RULE)
             lines.append("")
 
         lines.append(
             " Press Enter to strip injected content, or s to skip and keep raw content."
         )
 
-        self.query_one("#injection_explanation", Static).update("\n".join(lines))
+        # Plain Content: the injected text is shown verbatim, so skip the
+        # markup parse a str would get (and any brackets it would eat)
+        self.query_one("#injection_explanation", Static).update(
+            Content("\n".join(lines))
+        )
         self.query_one("#injection_status", Static).update(
             f" {len(patterns)} pattern(s), {total_ops} ops, {total_files} files — "
             f"Enter: strip | s: skip"
@@ -74,8 +84,6 @@ class InjectionReviewScreen(Screen):
         app = self.app  # type: FileRecoveryApp
 
         if app.injection_patterns:
-            from claude_file_recovery.core.injection import strip_injected_content
-
             strip_injected_content(app.raw_file_index, app.injection_patterns)
             # Also strip from merged index if it exists
             if app.merged_file_index:
@@ -98,17 +106,10 @@ class InjectionReviewScreen(Screen):
         self._navigate_next()
 
     def _navigate_next(self) -> None:
-        """Navigate to next screen using stack inspection pattern."""
-        # On initial mount, the screen below us is SymlinkReviewScreen.
-        # Pop to reveal it. If re-opened from FileListScreen, pop back to it.
-        screen_stack = self.app.screen_stack
-        if len(screen_stack) >= 2:
-            from claude_file_recovery.tui.file_list_screen import FileListScreen
-
-            if isinstance(screen_stack[-2], FileListScreen):
-                self.app.pop_screen()
-                return
-        # Initial flow: pop ourselves to reveal the next screen in the stack
+        """Pop back to the screen below us."""
+        # On initial mount, the screen below us is SymlinkReviewScreen; if
+        # re-opened from FileListScreen, it is that. Either way, popping
+        # ourselves reveals the next screen, so the stack needs no inspection.
         self.app.pop_screen()
 
     def action_quit_app(self) -> None: